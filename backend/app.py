@@ -1,33 +1,306 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
 import os
+import shutil
+import functools
+import tempfile
+import threading
 from werkzeug.utils import secure_filename
-import json
-from image_processing import process_image
+from werkzeug.formparser import parse_form_data
+import orjson
+import cv2
+from image_processing import file_digest, process_image, precise_process
 import subprocess
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'input')
 OUTPUT_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'output')
+VENDOR_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'docs', 'vendor')
+FRONTEND_FOLDER = os.path.join(os.path.dirname(__file__), '..', 'frontend')
+# Results of previous uploads, keyed by a hash of the image bytes
+CACHE_FOLDER = os.path.join(OUTPUT_FOLDER, '.cache')
+# three.js/loader bundles and frontend assets rarely change; let browsers keep them
+STATIC_MAX_AGE = 24 * 60 * 60
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+os.makedirs(CACHE_FOLDER, exist_ok=True)
+
+# Uploads are copied to disk in fixed-size chunks; nothing is buffered whole in memory
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_MB', 64)) * 1024 * 1024
+
+# Fallback Blender locations when it is not on PATH
+BLENDER_WINDOWS_CANDIDATES = [
+    r"C:\Program Files\Blender Foundation\Blender 5.0\blender.exe",
+    r"C:\Program Files\Blender Foundation\Blender\blender.exe",
+    r"C:\Program Files\Blender Foundation\Blender 4.1\blender.exe",
+    r"C:\Program Files\Blender Foundation\Blender 4.0\blender.exe",
+    r"C:\Program Files (x86)\Blender Foundation\Blender\blender.exe",
+]
+
+# Blender runs as a subprocess, so threads are enough to keep it off the request path
+BLENDER_WORKERS = int(os.environ.get('BLENDER_WORKERS', max(1, (os.cpu_count() or 2) // 2)))
+BLENDER_EXECUTOR = ThreadPoolExecutor(max_workers=BLENDER_WORKERS)
+_JOBS = {}
+_JOBS_LOCK = threading.Lock()
+# Small pool for reading saved detections in parallel, a batch at a time
+DETECTIONS_BATCH = 16
+DETECTIONS_EXECUTOR = ThreadPoolExecutor(max_workers=DETECTIONS_BATCH)
 
 app = Flask(__name__)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+# Behind nginx/Apache, hand file bodies to the front server via X-Sendfile (see
+# FLASK_INTEGRATION.md). Standalone, send_file already streams through the
+# server's wsgi.file_wrapper (sendfile(2) under gunicorn).
+app.config['USE_X_SENDFILE'] = os.environ.get('SKEMATIX_X_SENDFILE') == '1'
+
+
+def _upload_stream_factory(total_content_length, content_type, filename, content_length=None):
+    """
+    Stream each multipart file part straight to a hidden temp file in
+    UPLOAD_FOLDER. The factory isn't told the form field, so _receive_upload
+    moves only the `file` part into place and deletes the rest.
+    """
+    return tempfile.NamedTemporaryFile(dir=app.config['UPLOAD_FOLDER'], prefix='.upload-', delete=False)
+
+
+def _receive_upload():
+    """
+    Write the uploaded floorplan to UPLOAD_FOLDER without an intermediate copy.
+
+    Accepts either a raw body (Content-Type: application/octet-stream, filename
+    in the `filename` query arg or X-Filename header) or a multipart form with a
+    `file` field. Returns (filename, saved_path) or raises ValueError.
+    """
+    if request.mimetype == 'application/octet-stream':
+        filename = secure_filename(request.args.get('filename') or request.headers.get('X-Filename', ''))
+        if not filename:
+            raise ValueError('no selected file')
+        saved_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        with open(saved_path, 'wb') as fh:
+            while True:
+                chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                fh.write(chunk)
+        return filename, saved_path
+
+    _, _, files = parse_form_data(
+        request.environ,
+        stream_factory=_upload_stream_factory,
+        max_content_length=app.config['MAX_CONTENT_LENGTH'],
+    )
+    temp_paths = []
+    for _, part in files.items(multi=True):
+        part.close()
+        temp_paths.append(part.stream.name)
+    try:
+        if 'file' not in files:
+            raise ValueError('no file part')
+        filename = secure_filename(files['file'].filename or '')
+        if not filename:
+            raise ValueError('no selected file')
+        saved_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        os.replace(files['file'].stream.name, saved_path)
+    finally:
+        # Every other part (and `file` itself on error) is discarded
+        for path in temp_paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    return filename, saved_path
+
+
+def _cached_path(digest, suffix):
+    """Where the cache keeps an output for an image hash, e.g. '<digest>_walls.json'."""
+    return os.path.join(CACHE_FOLDER, f'{digest}_{suffix}')
+
+
+def _load_cached_result(digest, json_out):
+    """
+    Return the stored /upload response for an image hash, or None.
+
+    Only complete results (with a generated model still on disk) are reused.
+    The digest-keyed walls JSON is copied to `json_out` so /detections lists
+    it under the name it was uploaded as this time.
+    """
+    try:
+        with open(_cached_path(digest, 'result.json'), 'rb') as fh:
+            cached = orjson.loads(fh.read())
+    except (OSError, ValueError):
+        return None
+    gltf = cached.get('gltf')
+    walls_json = _cached_path(digest, 'walls.json')
+    if not gltf or not os.path.isfile(os.path.join(OUTPUT_FOLDER, os.path.basename(gltf))):
+        return None
+    if not os.path.isfile(walls_json):
+        return None
+    shutil.copyfile(walls_json, json_out)
+    return cached
+
+
+def _store_walls_snapshot(digest, filename, walls, scale):
+    """
+    Save the detected walls for an image hash when its job is queued. Taken
+    from memory rather than `json_out`, which a later upload under the same
+    name may overwrite while the job runs.
+    """
+    with open(_cached_path(digest, 'walls.json'), 'wb') as fh:
+        fh.write(orjson.dumps({
+            'image': filename,
+            'walls': walls,
+            'scale_m_per_px': scale
+        }, option=orjson.OPT_INDENT_2))
+
+
+def _store_cached_result(digest, walls, scale, gltf_url):
+    with open(_cached_path(digest, 'result.json'), 'wb') as fh:
+        fh.write(orjson.dumps({
+            'walls': walls,
+            'scale': scale,
+            'gltf': gltf_url
+        }))
+
+
+@functools.lru_cache(maxsize=1)
+def _find_blender():
+    """
+    Locate the Blender executable once per process (restart to pick up a new
+    install): BLENDER_PATH, then `blender` on PATH, then the usual Windows
+    install folders.
+    """
+    env_path = os.environ.get('BLENDER_PATH')
+    if env_path and os.path.exists(env_path):
+        blender_path = env_path
+    else:
+        blender_path = shutil.which('blender') or next(
+            (c for c in BLENDER_WINDOWS_CANDIDATES if os.path.exists(c)), None)
+    if blender_path:
+        print(f"✓ Found Blender at: {blender_path}")
+    return blender_path
+
+
+def _job_status_path(job_id):
+    return os.path.join(OUTPUT_FOLDER, f'{job_id}.status.json')
+
+
+def _read_job_status(job_id):
+    try:
+        with open(_job_status_path(job_id), 'rb') as fh:
+            return orjson.loads(fh.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_job_status(job_id, status, **fields):
+    """Replace the job's status file atomically so pollers never see a partial write."""
+    path = _job_status_path(job_id)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as fh:
+        fh.write(orjson.dumps(dict(fields, job_id=job_id, status=status)))
+    os.replace(tmp_path, path)
+
+
+def _run_blender_job(job_id, blender_path, walls, scale):
+    """
+    Background job: build the models and record the outcome in
+    output/<job_id>.status.json (queued -> running -> done/failed). Any
+    error, including one while caching the result, ends the job as failed.
+    """
+    try:
+        _write_job_status(job_id, 'running')
+        gltf_url = _generate_models(job_id, blender_path, walls, scale)
+        if gltf_url:
+            _store_cached_result(job_id, walls, scale, gltf_url)
+    except Exception as e:
+        print(f"ERROR: Job {job_id} failed: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        gltf_url = None
+
+    if gltf_url:
+        _write_job_status(job_id, 'done', gltf=gltf_url)
+    else:
+        _write_job_status(job_id, 'failed', gltf=None, error='3D generation failed, see server log')
+
+
+def _generate_models(job_id, blender_path, walls, scale):
+    """
+    Build the GLB with generate_3d.py, then the production cutaway. Outputs
+    are named by job id (the image hash), so jobs for different images
+    uploaded under the same name can't overwrite each other. Returns the
+    URL of the best model produced, or None.
+    """
+    gltf_out = os.path.join(OUTPUT_FOLDER, f'{job_id}_model.glb')
+    gltf_url = None
+
+    script_path = os.path.join(os.path.dirname(__file__), '..', 'blender', 'generate_3d.py')
+    print(f"Script path: {script_path}, exists: {os.path.exists(script_path)}")
+
+    # Hand the walls over on stdin rather than having Blender re-read json_out
+    walls_payload = orjson.dumps({'walls': walls, 'scale_m_per_px': scale}).decode()
+    cmd = [blender_path, '--background', '--python', script_path, '--', '-', gltf_out]
+    print(f"Running command: {' '.join(cmd)}")
+    
+    try:
+        result = subprocess.run(cmd, input=walls_payload, capture_output=True, text=True, timeout=300)
+        print(f"Blender stdout: {result.stdout}")
+        if result.stderr:
+            print(f"Blender stderr: {result.stderr}")
+        print(f"Return code: {result.returncode}")
+        
+        if result.returncode == 0:
+            if os.path.exists(gltf_out):
+                gltf_url = f'output/{job_id}_model.glb'
+                print(f"✓ Blender generation succeeded: {gltf_url}")
+                
+                # Now convert to production-grade professional cutaway model (open-top architectural visualization)
+                print(f"\n--- Converting to PRODUCTION-GRADE Cutaway model (open-top floor-plan visualization) ---")
+                cutaway_script = os.path.join(os.path.dirname(__file__), '..', 'blender', 'convert_to_cutaway_prod.py')
+                gltf_out_prod = os.path.join(OUTPUT_FOLDER, f'{job_id}_model_prod.glb')
+                cutaway_cmd = [blender_path, '--background', '--python', cutaway_script, '--', gltf_out, gltf_out_prod]
+                print(f"Production cutaway conversion command: {' '.join(cutaway_cmd)}")
+                
+                try:
+                    cutaway_result = subprocess.run(cutaway_cmd, capture_output=True, text=True, timeout=300)
+                    print(f"Production cutaway conversion stdout:\n{cutaway_result.stdout}")
+                    if cutaway_result.stderr:
+                        print(f"Production cutaway conversion stderr: {cutaway_result.stderr}")
+                    print(f"Production cutaway return code: {cutaway_result.returncode}")
+                    
+                    if cutaway_result.returncode == 0 and os.path.exists(gltf_out_prod):
+                        gltf_url = f'output/{job_id}_model_prod.glb'
+                        print(f"✓ PRODUCTION-GRADE CUTAWAY CONVERSION SUCCEEDED: {gltf_url}")
+                    else:
+                        print(f"WARNING: Production cutaway conversion failed or output not found, using Type-1")
+                        gltf_url = f'output/{job_id}_model.glb'
+                except Exception as e:
+                    print(f"WARNING: Production cutaway conversion error: {type(e).__name__}: {e}")
+                    print(f"Falling back to Type-1 model")
+                    gltf_url = f'output/{job_id}_model.glb'
+            else:
+                print(f"ERROR: Blender completed but output file not found: {gltf_out}")
+        else:
+            print(f"ERROR: Blender failed with return code {result.returncode}")
+    except subprocess.TimeoutExpired:
+        print(f"ERROR: Blender execution timed out (>300 seconds)")
+    except Exception as e:
+        print(f"ERROR: Blender execution failed: {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+
+    return gltf_url
 
 
 @app.route('/upload', methods=['POST'])
 def upload_floorplan():
-    if 'file' not in request.files:
-        return jsonify({'error': 'no file part'}), 400
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'no selected file'}), 400
-    filename = secure_filename(file.filename)
-    saved_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(saved_path)
+    try:
+        filename, saved_path = _receive_upload()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     # Validate the image can be loaded
-    import cv2
     img = cv2.imread(saved_path)
     if img is None:
         os.remove(saved_path)  # Remove invalid file
@@ -37,17 +310,24 @@ def upload_floorplan():
     # Use unique filename based on input image name
     base_name = os.path.splitext(filename)[0]
     json_out = os.path.join(OUTPUT_FOLDER, f'{base_name}_walls.json')
+
+    # Same image bytes as an earlier upload: reuse its walls and model
+    digest = file_digest(saved_path)
+    cached = _load_cached_result(digest, json_out)
+    if cached:
+        print(f"Cache hit for {filename} ({digest}): {cached['gltf']}")
+        return jsonify({'walls': cached['walls'], 'scale': cached['scale'], 'filename': filename, 'gltf': cached['gltf']})
+
     print(f"Processing image: {saved_path}, exists: {os.path.exists(saved_path)}")
     walls = []
     scale = None
     try:
-        from image_processing import precise_process
-        walls, scale = precise_process(saved_path, json_out, debug=False)
+        walls, scale = precise_process(saved_path, json_out, debug=False, img=img, digest=digest)
         print(f"Precise process succeeded, walls: {len(walls) if walls else 0}")
     except Exception as e:
         print(f"Precise process failed: {e}, falling back")
         try:
-            walls = process_image(saved_path, json_out)
+            walls = process_image(saved_path, json_out, img=img, digest=digest)
             print(f"Fallback process succeeded, walls: {len(walls) if walls else 0}")
         except Exception as e2:
             print(f"Fallback process also failed: {e2}")
@@ -55,131 +335,105 @@ def upload_floorplan():
             scale = None
 
     # Optionally run Blender to generate 3D (requires Blender installed)
-    # Check common Blender installation paths
-    blender_candidates = [
-        os.environ.get('BLENDER_PATH'),  # From environment variable
-        r"C:\Program Files\Blender Foundation\Blender 5.0\blender.exe",
-        r"C:\Program Files\Blender Foundation\Blender\blender.exe",
-        r"C:\Program Files\Blender Foundation\Blender 4.1\blender.exe",
-        r"C:\Program Files\Blender Foundation\Blender 4.0\blender.exe",
-        r"C:\Program Files (x86)\Blender Foundation\Blender\blender.exe",
-    ]
-    
-    blender_path = None
-    for candidate in blender_candidates:
-        if candidate and os.path.exists(candidate):
-            blender_path = candidate
-            print(f"✓ Found Blender at: {blender_path}")
-            break
-    
-    gltf_out = os.path.join(OUTPUT_FOLDER, f'{base_name}_model.glb')
-    gltf_out_type2 = os.path.join(OUTPUT_FOLDER, f'{base_name}_model_type2.glb')
-    gltf_url = None
-    
-    if blender_path:
-        script_path = os.path.join(os.path.dirname(__file__), '..', 'blender', 'generate_3d.py')
-        print(f"Script path: {script_path}, exists: {os.path.exists(script_path)}")
-        print(f"JSON input: {json_out}, exists: {os.path.exists(json_out)}")
-        
-        cmd = [blender_path, '--background', '--python', script_path, '--', json_out, gltf_out]
-        print(f"Running command: {' '.join(cmd)}")
-        
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            print(f"Blender stdout: {result.stdout}")
-            if result.stderr:
-                print(f"Blender stderr: {result.stderr}")
-            print(f"Return code: {result.returncode}")
-            
-            if result.returncode == 0:
-                if os.path.exists(gltf_out):
-                    gltf_url = f'output/{base_name}_model.glb'
-                    print(f"✓ Blender generation succeeded: {gltf_url}")
-                    
-                    # Now convert to production-grade professional cutaway model (open-top architectural visualization)
-                    print(f"\n--- Converting to PRODUCTION-GRADE Cutaway model (open-top floor-plan visualization) ---")
-                    cutaway_script = os.path.join(os.path.dirname(__file__), '..', 'blender', 'convert_to_cutaway_prod.py')
-                    gltf_out_prod = os.path.join(OUTPUT_FOLDER, f'{base_name}_model_prod.glb')
-                    cutaway_cmd = [blender_path, '--background', '--python', cutaway_script, '--', gltf_out, gltf_out_prod]
-                    print(f"Production cutaway conversion command: {' '.join(cutaway_cmd)}")
-                    
-                    try:
-                        cutaway_result = subprocess.run(cutaway_cmd, capture_output=True, text=True, timeout=300)
-                        print(f"Production cutaway conversion stdout:\n{cutaway_result.stdout}")
-                        if cutaway_result.stderr:
-                            print(f"Production cutaway conversion stderr: {cutaway_result.stderr}")
-                        print(f"Production cutaway return code: {cutaway_result.returncode}")
-                        
-                        if cutaway_result.returncode == 0 and os.path.exists(gltf_out_prod):
-                            gltf_url = f'output/{base_name}_model_prod.glb'
-                            print(f"✓ PRODUCTION-GRADE CUTAWAY CONVERSION SUCCEEDED: {gltf_url}")
-                        else:
-                            print(f"WARNING: Production cutaway conversion failed or output not found, using Type-1")
-                            gltf_url = f'output/{base_name}_model.glb'
-                    except Exception as e:
-                        print(f"WARNING: Production cutaway conversion error: {type(e).__name__}: {e}")
-                        print(f"Falling back to Type-1 model")
-                        gltf_url = f'output/{base_name}_model.glb'
-                else:
-                    print(f"ERROR: Blender completed but output file not found: {gltf_out}")
-            else:
-                print(f"ERROR: Blender failed with return code {result.returncode}")
-        except subprocess.TimeoutExpired:
-            print(f"ERROR: Blender execution timed out (>300 seconds)")
-        except Exception as e:
-            print(f"ERROR: Blender execution failed: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
-    else:
-        print("WARNING: Blender not found in any common installation path.")
+    blender_path = _find_blender()
 
-    return jsonify({'walls': walls, 'scale': scale, 'filename': filename, 'gltf': gltf_url})
+    if not blender_path:
+        print("WARNING: Blender not found (set BLENDER_PATH or put blender on PATH).")
+        return jsonify({'walls': walls, 'scale': scale, 'filename': filename, 'gltf': None})
+
+    # Model generation takes minutes; hand it to the job pool and let the
+    # client poll /jobs/<job_id>. Identical images share one job.
+    job_id = digest
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+        if job is None or job.done():
+            _store_walls_snapshot(job_id, filename, walls, scale)
+            _write_job_status(job_id, 'queued')
+            _JOBS[job_id] = BLENDER_EXECUTOR.submit(_run_blender_job, job_id, blender_path, walls, scale)
+    return jsonify({'walls': walls, 'scale': scale, 'filename': filename, 'gltf': None, 'job_id': job_id}), 202
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job_id = secure_filename(job_id)
+    # Look at the future before the status file: a job writes its final
+    # status before its future completes
+    with _JOBS_LOCK:
+        job = _JOBS.get(job_id)
+    live = job is not None and not job.done()
+    status = _read_job_status(job_id)
+    if status is None:
+        return jsonify({'error': 'unknown job'}), 404
+    if status.get('status') in ('queued', 'running') and not live:
+        # Left behind by a crash or server restart; nothing will finish it
+        status = dict(status, status='failed', gltf=None, error='job is no longer running')
+    return jsonify(status)
 
 
 @app.route('/input/<path:filename>')
 def serve_input(filename):
-    base = os.path.join(os.path.dirname(__file__), '..', 'input')
-    return send_from_directory(base, filename)
+    return send_from_directory(UPLOAD_FOLDER, filename)
 
 
 @app.route('/output/<path:filename>')
 def serve_output(filename):
-    base = os.path.join(os.path.dirname(__file__), '..', 'output')
-    return send_from_directory(base, filename)
+    return send_from_directory(OUTPUT_FOLDER, filename)
 
 
 @app.route('/vendor/<path:filename>')
 def serve_vendor(filename):
     # serve three.js and loader modules placed in docs/vendor
-    base = os.path.join(os.path.dirname(__file__), '..', 'docs', 'vendor')
-    return send_from_directory(base, filename)
+    return send_from_directory(VENDOR_FOLDER, filename, max_age=STATIC_MAX_AGE)
 
 
 @app.route('/frontend/<path:filename>')
 def serve_frontend(filename):
-    base = os.path.join(os.path.dirname(__file__), '..', 'frontend')
-    return send_from_directory(base, filename)
+    return send_from_directory(FRONTEND_FOLDER, filename)
 
 
 # Serve static assets (CSS, JS, etc)
 @app.route('/static/<path:filename>')
 def serve_static(filename):
-    base = os.path.join(os.path.dirname(__file__), '..', 'frontend')
-    return send_from_directory(base, filename)
+    return send_from_directory(FRONTEND_FOLDER, filename, max_age=STATIC_MAX_AGE)
+
+
+def _read_walls_file(path):
+    """Raw bytes of a saved detection file, or None if it isn't valid JSON."""
+    try:
+        with open(path, 'rb') as fh:
+            raw = fh.read()
+        orjson.loads(raw)  # validate only; the bytes are sent as-is
+        return raw
+    except Exception:
+        return None
 
 
 @app.route('/detections', methods=['GET'])
 def list_detections():
-    out_dir = Path(os.path.join(os.path.dirname(__file__), '..', 'output'))
-    files = list(out_dir.glob('*_walls.json'))
-    data = {}
-    for f in files:
-        try:
-            with open(f, 'r') as fh:
-                data[f.stem.replace('_walls','')] = json.load(fh)
-        except Exception:
-            continue
-    return jsonify(data)
+    # scandir hands back names without stat-ing each entry the way Path.glob does
+    with os.scandir(OUTPUT_FOLDER) as it:
+        files = [e.path for e in it
+                 if e.name.endswith('_walls.json') and not e.name.startswith('.')]
+
+    def generate():
+        # Emit one entry at a time; the files are already JSON, so they are
+        # spliced in without a parse/serialize round-trip. Reads run a few at a
+        # time on the pool (file reads release the GIL).
+        yield b'{'
+        first = True
+        for i in range(0, len(files), DETECTIONS_BATCH):
+            batch = files[i:i + DETECTIONS_BATCH]
+            for f, raw in zip(batch, DETECTIONS_EXECUTOR.map(_read_walls_file, batch)):
+                if raw is None:
+                    continue
+                if not first:
+                    yield b','
+                first = False
+                stem = os.path.basename(f)[:-len('.json')]
+                yield orjson.dumps(stem.replace('_walls','')) + b':' + raw
+        yield b'}'
+
+    return Response(generate(), mimetype='application/json')
 
 
 @app.route('/detections/save', methods=['POST'])
@@ -192,8 +446,8 @@ def save_detections():
     out_dir = os.path.join(os.path.dirname(__file__), '..', 'output')
     os.makedirs(out_dir, exist_ok=True)
     out_file = os.path.join(out_dir, f'{image}_walls.json')
-    with open(out_file, 'w') as fh:
-        json.dump(data, fh, indent=2)
+    with open(out_file, 'wb') as fh:
+        fh.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     return jsonify({'ok': True})
 
 
@@ -201,4 +455,6 @@ if __name__ == '__main__':
     host = '0.0.0.0'
     port = int(os.environ.get('PORT', 5000))
     print(f'Starting Skematix backend on http://{host}:{port} (press CTRL+C to stop)')
+    if not _find_blender():
+        print('WARNING: Blender not found; /upload will return walls without a 3D model.')
     app.run(debug=True, host=host, port=port)
@@ -1,23 +1,168 @@
 import cv2
+import hashlib
+import heapq
 import numpy as np
-import json
+import orjson
 import os
 
-
-def process_image(image_path, json_output_path=None, debug=False, method='hough', normalize=True):
+# Run the image filters through OpenCL (T-API) when a device is available;
+# otherwise everything stays on plain host arrays
+USE_OPENCL = cv2.ocl.haveOpenCL()
+
+# Per-image intermediates (Hough lines) keyed by content hash; shared with the
+# backend's upload cache directory
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "output", ".cache")
+CACHE_MAX_ENTRIES = 256
+
+# Rect structuring elements for the folded morphology passes, built once
+_K7, _K9, _K11, _K13, _K19 = (cv2.getStructuringElement(cv2.MORPH_RECT, (k, k))
+                              for k in (7, 9, 11, 13, 19))
+
+# Probabilistic Hough settings for wall strokes
+_HOUGH_PARAMS = dict(
+    rho=1,
+    theta=np.pi / 180,
+    threshold=40,  # Lowered threshold to catch more lines
+    minLineLength=15,  # Reduced minimum length
+    maxLineGap=20  # Reduced gap tolerance
+)
+_CANNY_THRESHOLDS = (20, 60)
+
+# Cached Hough lines are only valid for the settings that produced them; the
+# key carries a hash of those settings so changing any of them (or bumping
+# the version after a change to _hough_lines itself) starts a fresh cache
+_LINES_STAGE_VERSION = 1
+_LINES_STAGE = "lines-" + hashlib.sha256(repr((
+    _LINES_STAGE_VERSION,
+    sorted(_HOUGH_PARAMS.items()),
+    _CANNY_THRESHOLDS,
+    [k.shape for k in (_K7, _K9, _K11)],
+)).encode()).hexdigest()[:8]
+
+
+def file_digest(path):
+    """Short SHA-256 of a file's contents; the key for every per-image cache."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def _prune_cache():
+    """Keep at most CACHE_MAX_ENTRIES arrays, dropping the least recently used."""
+    with os.scandir(CACHE_DIR) as it:
+        entries = [e for e in it if e.name.endswith(".npy")]
+    if len(entries) <= CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for e in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(e.path)
+        except OSError:
+            pass
+
+
+def _disk_cached(image_path, stage, compute, digest=None):
     """
-    Process a floorplan image and extract wall information.
+    Return the array for (image contents, stage) from CACHE_DIR, or compute
+    and store it. Hits are memory-mapped read-only; mtime doubles as LRU stamp.
+    Pass the image's `digest` if the caller already has it.
+    """
+    if digest is None:
+        try:
+            digest = file_digest(image_path)
+        except OSError:
+            return compute()
+    key = digest
+    path = os.path.join(CACHE_DIR, f"{key}_{stage}.npy")
+
+    try:
+        arr = np.load(path, mmap_mode="r", allow_pickle=False)
+        os.utime(path)
+        return arr
+    except (OSError, ValueError):
+        pass
+
+    arr = compute()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.save(fh, arr, allow_pickle=False)
+        os.replace(tmp_path, path)
+        _prune_cache()
+    except OSError:
+        pass
+    return arr
+
+
+def _host(arr):
+    """Host numpy view of a cv2.UMat (no-op for numpy arrays)."""
+    return arr.get() if isinstance(arr, cv2.UMat) else arr
+
+
+def merge_walls(walls_list, merge_threshold=60):
+    """
+    Merge overlapping or nearby wall bounding boxes.
 
-    method:
-      - 'basic' : contour-based wall detection
-      - 'hough' : line-based wall detection (default)
+    Walls are visited in order; each unmerged wall absorbs every later
+    unmerged wall that overlaps it, or that is aligned with it (top edges /
+    left edges within `merge_threshold`) and overlaps along that axis.
+
+    Candidate pairs come from a sweep over boxes sorted by left edge, so only
+    boxes whose x-range (widened to `merge_threshold` from the left edge) is
+    still open are compared.
     """
-    img = cv2.imread(image_path)
-    if img is None:
-        raise FileNotFoundError(image_path)
+    if not walls_list:
+        return walls_list
+
+    b = np.array([[w["bbox"]["x"], w["bbox"]["y"],
+                   w["bbox"]["x"] + w["bbox"]["w"], w["bbox"]["y"] + w["bbox"]["h"]]
+                  for w in walls_list], dtype=np.int64)
+    n = len(b)
+    x0, y0, x1, y1 = b.T.tolist()
+
+    # Every mergeable pair overlaps in x or has left edges within the
+    # threshold, so a box stays active until max(x1, x0 + threshold)
+    partners = [[] for _ in range(n)]
+    active = []  # heap of (x-extent end, index)
+    for j in sorted(range(n), key=x0.__getitem__):
+        while active and active[0][0] <= x0[j]:
+            heapq.heappop(active)
+        for _, i in active:
+            overlap_x = min(x1[i], x1[j]) - max(x0[i], x0[j]) > 0
+            overlap_y = min(y1[i], y1[j]) - max(y0[i], y0[j]) > 0
+            is_horizontal = abs(y0[i] - y0[j]) < merge_threshold
+            is_vertical = abs(x0[i] - x0[j]) < merge_threshold
+            if (overlap_x and overlap_y) or (is_horizontal and overlap_x) or (is_vertical and overlap_y):
+                # Only later walls can be absorbed
+                lo, hi = (i, j) if i < j else (j, i)
+                partners[lo].append(hi)
+        heapq.heappush(active, (max(x1[j], x0[j] + merge_threshold), j))
+
+    merged = []
+    used = np.zeros(n, dtype=bool)
+    for i in range(n):
+        if used[i]:
+            continue
+        group = [i] + [j for j in partners[i] if not used[j]]
+        used[group] = True
+
+        members = b[group]
+        gx0, gy0 = members[:, :2].min(axis=0)
+        gx1, gy1 = members[:, 2:].max(axis=0)
+        merged.append({"bbox": {"x": int(gx0), "y": int(gy0), "w": int(gx1 - gx0), "h": int(gy1 - gy0)}})
 
+    return merged
+
+
+def _hough_lines(img):
+    """Binarize a BGR image and return its Hough wall strokes as an (N, 4) int32 array."""
+    h_img, w_img = img.shape[:2]
+    if USE_OPENCL:
+        img = cv2.UMat(img)
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    h_img, w_img = gray.shape
 
     # --- Binarization with adaptive approach ---
     # Try to separate walls from background
@@ -27,69 +172,76 @@ def process_image(image_path, json_output_path=None, debug=False, method='hough'
     _, th = cv2.threshold(blur, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
     # Invert if needed (walls should be white/foreground)
-    if np.mean(th == 255) < 0.3:  # More than 70% black - invert
+    if cv2.countNonZero(th) < 0.3 * h_img * w_img:  # More than 70% black - invert
         th = cv2.bitwise_not(th)
 
     # --- Enhanced Morphology ---
-    # Use larger kernel to better connect wall segments
-    kernel_close = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-    th = cv2.morphologyEx(th, cv2.MORPH_CLOSE, kernel_close, iterations=2)
-    
-    kernel_open = cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3))
-    th = cv2.morphologyEx(th, cv2.MORPH_OPEN, kernel_open, iterations=1)
-    
-    # Additional dilation to emphasize walls
-    th = cv2.dilate(th, kernel_close, iterations=1)
-
-    walls = []
-    processed = th.copy()
+    # close(5x5) x2 -> open(3x3) -> dilate(5x5), folded into three passes:
+    # stacked rect dilations/erosions compose into one larger rect
+    # (5x5 twice = 9x9, 9x9 then 3x3 = 11x11, 3x3 then 5x5 = 7x7)
+    th = cv2.dilate(th, _K9)
+    th = cv2.erode(th, _K11)
+    th = cv2.dilate(th, _K7)
 
     # ======================================================
     # HOUGH LINE DETECTION (improved)
     # ======================================================
-    edges = cv2.Canny(processed, 20, 60)
-
-    lines = cv2.HoughLinesP(
-        edges,
-        rho=1,
-        theta=np.pi / 180,
-        threshold=40,  # Lowered threshold to catch more lines
-        minLineLength=15,  # Reduced minimum length
-        maxLineGap=20  # Reduced gap tolerance
-    )
+    edges = cv2.Canny(th, *_CANNY_THRESHOLDS)
+
+    lines = cv2.HoughLinesP(edges, **_HOUGH_PARAMS)
+    lines = _host(lines)
+    if lines is None:
+        return np.empty((0, 4), dtype=np.int32)
+    return lines.reshape(-1, 4)
+
+
+def _detect_walls_px(image_path, img=None, debug=False, digest=None):
+    """
+    Run the detection pipeline once and return (walls_px, (h_img, w_img)).
+
+    Wall bboxes are in pixels. Pass `img` if the caller has already decoded
+    the image, and `digest` (file_digest) if it has already hashed it, to
+    skip reading it again.
+    """
+    if img is None:
+        img = cv2.imread(image_path)
+    if img is None:
+        raise FileNotFoundError(image_path)
 
-    mask = np.zeros_like(processed)
+    h_img, w_img = img.shape[:2]
+    # Binarization, morphology, Canny and Hough only depend on the image bytes
+    # and the detection settings folded into _LINES_STAGE
+    lines = _disk_cached(image_path, _LINES_STAGE, lambda: _hough_lines(img), digest=digest)
 
-    if lines is not None:
-        lines = lines.reshape(-1, 4)
+    # Line drawing, contours and merging run on the host
+    walls = []
+    mask = np.zeros((h_img, w_img), dtype=np.uint8)
 
-        for (x1, y1, x2, y2) in lines:
-            cv2.line(mask, (x1, y1), (x2, y2), 255, thickness=3)  # Thinner lines for precision
+    for (x1, y1, x2, y2) in lines.tolist():
+        cv2.line(mask, (x1, y1), (x2, y2), 255, thickness=3)  # Thinner lines for precision
 
-    # Merge line segments into wall segments
-    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (7, 7))
-    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel, iterations=2)
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, iterations=1)
+    if USE_OPENCL:
+        mask = cv2.UMat(mask)
 
-    # Extract contours
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # Merge line segments into wall segments: close(7x7) x2 then open(7x7),
+    # folded the same way (dilate 13x13, erode 19x19, dilate 7x7)
+    mask = cv2.dilate(mask, _K13)
+    mask = cv2.erode(mask, _K19)
+    mask = cv2.dilate(mask, _K7)
 
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area < 300:  # Adjusted minimum area
-            continue
+    # Extract wall blobs: one C pass gives bbox + area for every component
+    mask = _host(mask)
+    _, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
+    stats = stats[1:]  # label 0 is the background
 
-        # Approximate contour to reduce noise
-        epsilon = 0.02 * cv2.arcLength(cnt, True)
-        approx = cv2.approxPolyDP(cnt, epsilon, True)
-        
-        # Get bounding box
-        x, y, w, h = cv2.boundingRect(approx)
-        
-        # Filter out very small walls
-        if w < 5 or h < 5:
-            continue
-        
+    keep = (
+        (stats[:, cv2.CC_STAT_AREA] >= 300)  # Adjusted minimum area
+        & (stats[:, cv2.CC_STAT_WIDTH] >= 5)  # Filter out very small walls
+        & (stats[:, cv2.CC_STAT_HEIGHT] >= 5)
+    )
+    # Labels run top-to-bottom; walk them bottom-up like findContours did so
+    # merge_walls sees the same order
+    for x, y, w, h, area in stats[keep][::-1].tolist():
         walls.append({
             "bbox": {"x": x, "y": y, "w": w, "h": h},
             "area": area
@@ -100,221 +252,61 @@ def process_image(image_path, json_output_path=None, debug=False, method='hough'
     # ======================================================
     # WALL MERGING TO CONNECT DISCONNECTED SEGMENTS
     # ======================================================
-    def merge_walls(walls_list, merge_threshold=60):
-        """
-        Merge overlapping or nearby wall bounding boxes with improved logic.
-        """
-        if not walls_list:
-            return walls_list
-
-        merged = []
-        used = [False] * len(walls_list)
-
-        for i, w1 in enumerate(walls_list):
-            if used[i]:
-                continue
-
-            b1 = w1["bbox"]
-            x1, y1, w1_w, h1 = b1["x"], b1["y"], b1["w"], b1["h"]
-            x1_end, y1_end = x1 + w1_w, y1 + h1
-
-            # Find walls to merge with
-            to_merge = [i]
-            for j in range(i + 1, len(walls_list)):
-                if used[j]:
-                    continue
-
-                b2 = walls_list[j]["bbox"]
-                x2, y2, w2_w, h2 = b2["x"], b2["y"], b2["w"], b2["h"]
-                x2_end, y2_end = x2 + w2_w, y2 + h2
-
-                # Check overlap
-                overlap_x = max(0, min(x1_end, x2_end) - max(x1, x2))
-                overlap_y = max(0, min(y1_end, y2_end) - max(y1, y2))
-
-                # Check if aligned (horizontal or vertical)
-                is_horizontal = abs(y1 - y2) < merge_threshold
-                is_vertical = abs(x1 - x2) < merge_threshold
-
-                # Merge if overlapping or aligned and close
-                if (overlap_x > 0 and overlap_y > 0) or \
-                   (is_horizontal and overlap_x > 0) or \
-                   (is_vertical and overlap_y > 0):
-                    to_merge.append(j)
-                    used[j] = True
-
-            # Create merged wall
-            merged_bbox = {
-                "x": min(walls_list[k]["bbox"]["x"] for k in to_merge),
-                "y": min(walls_list[k]["bbox"]["y"] for k in to_merge),
-                "x_end": max(walls_list[k]["bbox"]["x"] + walls_list[k]["bbox"]["w"] for k in to_merge),
-                "y_end": max(walls_list[k]["bbox"]["y"] + walls_list[k]["bbox"]["h"] for k in to_merge),
-            }
-            merged_bbox["w"] = merged_bbox["x_end"] - merged_bbox["x"]
-            merged_bbox["h"] = merged_bbox["y_end"] - merged_bbox["y"]
-
-            merged.append({
-                "bbox": {k: merged_bbox[k] for k in ["x", "y", "w", "h"]}
-            })
-            used[i] = True
-
-        return merged
-
     walls = merge_walls(walls, merge_threshold=60)
 
-    # ======================================================
-    # NORMALIZATION + SAVE
-    # ======================================================
-    output_walls = []
-
-    for w in walls:
-        b = w["bbox"]
-        if normalize:
-            output_walls.append({
-                "bbox": {
-                    "x": b["x"] / w_img,
-                    "y": b["y"] / h_img,
-                    "w": b["w"] / w_img,
-                    "h": b["h"] / h_img
-                }
-            })
-        else:
-            output_walls.append(w)
-
-    if json_output_path:
-        os.makedirs(os.path.dirname(json_output_path), exist_ok=True)
-        with open(json_output_path, "w") as f:
-            json.dump({
-                "image": os.path.basename(image_path),
-                "walls": output_walls
-            }, f, indent=2)
-
     if debug:
         dbg = os.path.join(os.path.dirname(image_path), "debug_processed.png")
         cv2.imwrite(dbg, processed)
 
-    return output_walls
+    return walls, (h_img, w_img)
 
-    # ======================================================
-    # WALL MERGING TO CONNECT DISCONNECTED SEGMENTS
-    # ======================================================
-    def merge_walls(walls_list, merge_threshold=50):
-        """
-        Merge overlapping or nearby wall bounding boxes to create continuous walls.
-        Use a more aggressive merging strategy to connect disconnected segments.
-        """
-        if not walls_list:
-            return walls_list
-
-        merged = []
-        used = [False] * len(walls_list)
-
-        for i, w1 in enumerate(walls_list):
-            if used[i]:
-                continue
-
-            b1 = w1["bbox"]
-            x1, y1, w1_w, h1 = b1["x"], b1["y"], b1["w"], b1["h"]
-            x1_end, y1_end = x1 + w1_w, y1 + h1
-
-            # Find walls to merge with (recursive merging)
-            to_merge = [i]
-            stack = [i]
-            while stack:
-                current = stack.pop()
-                if used[current]:
-                    continue
-                used[current] = True
-
-                cb = walls_list[current]["bbox"]
-                cx, cy, cw, ch = cb["x"], cb["y"], cb["w"], cb["h"]
-                cx_end, cy_end = cx + cw, cy + ch
-
-                for j, w2 in enumerate(walls_list):
-                    if used[j]:
-                        continue
-
-                    b2 = w2["bbox"]
-                    x2, y2, w2_w, h2 = b2["x"], b2["y"], b2["w"], b2["h"]
-                    x2_end, y2_end = x2 + w2_w, y2 + h2
-
-                    # Check for overlap or proximity (more lenient)
-                    overlap_x = max(0, min(cx_end, x2_end) - max(cx, x2))
-                    overlap_y = max(0, min(cy_end, y2_end) - max(cy, y2))
-
-                    # Distance between centers
-                    center_dist = ((cx + cw/2 - x2 - w2_w/2)**2 + (cy + ch/2 - y2 - h2/2)**2)**0.5
-
-                    # Merge if significant overlap, close proximity, or aligned
-                    if (overlap_x > 0 and overlap_y > min(ch, h2) * 0.3) or \
-                       (overlap_y > 0 and overlap_x > min(cw, w2_w) * 0.3) or \
-                       (center_dist < merge_threshold and (abs(cx - x2) < merge_threshold or abs(cy - y2) < merge_threshold)):
-                        to_merge.append(j)
-                        stack.append(j)
-
-            # Merge all found walls
-            if len(to_merge) > 1:
-                min_x = min(walls_list[k]["bbox"]["x"] for k in to_merge)
-                min_y = min(walls_list[k]["bbox"]["y"] for k in to_merge)
-                max_x_end = max(walls_list[k]["bbox"]["x"] + walls_list[k]["bbox"]["w"] for k in to_merge)
-                max_y_end = max(walls_list[k]["bbox"]["y"] + walls_list[k]["bbox"]["h"] for k in to_merge)
-
-                merged_wall = {
-                    "bbox": {
-                        "x": min_x,
-                        "y": min_y,
-                        "w": max_x_end - min_x,
-                        "h": max_y_end - min_y
-                    }
-                }
-                merged.append(merged_wall)
-            else:
-                merged.append(w1)
-                used[i] = True
-
-        return merged
-
-    walls = merge_walls(walls, merge_threshold=50)
 
-    # ======================================================
-    # NORMALIZATION + SAVE
-    # ======================================================
-    output_walls = []
-
-    for w in walls:
-        b = w["bbox"]
-        if normalize:
-            output_walls.append({
-                "bbox": {
-                    "x": b["x"] / w_img,
-                    "y": b["y"] / h_img,
-                    "w": b["w"] / w_img,
-                    "h": b["h"] / h_img
-                }
-            })
-        else:
-            output_walls.append(w)
+# Decimal places kept in normalized coordinates; 1e-5 stays under a pixel
+# for images up to 100k px across and keeps the JSON short
+NORM_DECIMALS = 5
+
+
+def _normalize_walls(walls_px, h_img, w_img):
+    return [{
+        "bbox": {
+            "x": round(w["bbox"]["x"] / w_img, NORM_DECIMALS),
+            "y": round(w["bbox"]["y"] / h_img, NORM_DECIMALS),
+            "w": round(w["bbox"]["w"] / w_img, NORM_DECIMALS),
+            "h": round(w["bbox"]["h"] / h_img, NORM_DECIMALS)
+        }
+    } for w in walls_px]
+
+
+def process_image(image_path, json_output_path=None, debug=False, method='hough', normalize=True,
+                  img=None, digest=None):
+    """
+    Process a floorplan image and extract wall information.
+
+    method:
+      - 'basic' : contour-based wall detection
+      - 'hough' : line-based wall detection (default)
+    """
+    walls, (h_img, w_img) = _detect_walls_px(image_path, img=img, debug=debug, digest=digest)
+
+    output_walls = _normalize_walls(walls, h_img, w_img) if normalize else walls
 
     if json_output_path:
         os.makedirs(os.path.dirname(json_output_path), exist_ok=True)
-        with open(json_output_path, "w") as f:
-            json.dump({
+        with open(json_output_path, "wb") as f:
+            f.write(orjson.dumps({
                 "image": os.path.basename(image_path),
                 "walls": output_walls
-            }, f, indent=2)
-
-    if debug:
-        dbg = os.path.join(os.path.dirname(image_path), "debug_processed.png")
-        cv2.imwrite(dbg, processed)
+            }, option=orjson.OPT_INDENT_2))
 
     return output_walls
 
 
-def precise_process(image_path, json_output_path=None, thickness_m=0.2, wall_height=3.0, orthogonal=True, debug=False):
+def precise_process(image_path, json_output_path=None, thickness_m=0.2, wall_height=3.0, orthogonal=True, debug=False,
+                    img=None, digest=None):
     """
     Higher-precision pipeline that estimates scale and outputs 3D-ready data.
     """
-    walls_px = process_image(image_path, None, debug=False, method='hough', normalize=False)
+    walls_px, (h_img, w_img) = _detect_walls_px(image_path, img=img, digest=digest)
 
     if not walls_px:
         raise RuntimeError("No walls detected")
@@ -325,30 +317,18 @@ def precise_process(image_path, json_output_path=None, thickness_m=0.2, wall_hei
 
     scale = thickness_m / thickness_px
 
-    h_img, w_img = cv2.imread(image_path).shape[:2]
-    norm_walls = []
-
-    for w in walls_px:
-        b = w["bbox"]
-        norm_walls.append({
-            "bbox": {
-                "x": b["x"] / w_img,
-                "y": b["y"] / h_img,
-                "w": b["w"] / w_img,
-                "h": b["h"] / h_img
-            }
-        })
+    norm_walls = _normalize_walls(walls_px, h_img, w_img)
 
     if json_output_path:
         os.makedirs(os.path.dirname(json_output_path), exist_ok=True)
-        with open(json_output_path, "w") as f:
-            json.dump({
+        with open(json_output_path, "wb") as f:
+            f.write(orjson.dumps({
                 "image": os.path.basename(image_path),
                 "walls": norm_walls,
                 "scale_m_per_px": scale,
                 "thickness_m": thickness_m,
                 "wall_height_m": wall_height
-            }, f, indent=2)
+            }, option=orjson.OPT_INDENT_2))
 
     return norm_walls, scale
 
@@ -28,11 +28,20 @@ blender --background --python convert_to_cutaway.py -- input.glb output.glb
 """
 
 import bpy
+import bmesh
 import json
 import sys
 import os
 from mathutils import Vector, Matrix
 import math
+import numpy as np
+
+# Numba is not bundled with Blender; use it for the bounds kernel when the
+# Python environment has it, otherwise stay on plain NumPy
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
 
 # ============================================================================
 # CONFIGURATION
@@ -55,6 +64,11 @@ WINDOW_SILL_HEIGHT_M = 0.65
 WINDOW_WIDTH_M = 0.8
 WINDOW_HEIGHT_M = 0.5
 
+# Boolean solver: axis-aligned box cuts on simple walls use FAST, falling
+# back to MANIFOLD for dense walls or when FAST leaves degenerate faces
+FAST_BOOLEAN_MAX_FACES = 1000
+DEGENERATE_FACE_AREA = 1e-8
+
 # Materials (high-contrast for architectural diagrams)
 COLOR_WALLS_RGB = (0.92, 0.85, 0.74)  # Warm beige/sand tone
 COLOR_FLOOR_RGB = (0.45, 0.45, 0.48)  # Dark neutral gray
@@ -74,6 +88,41 @@ def log(msg, level="INFO"):
     }.get(level, "[Cutaway]")
     print(f"{prefix} {msg}")
 
+# ============================================================================
+# MESH HELPERS
+# ============================================================================
+
+def bake_matrix(obj, matrix=None):
+    """
+    Bake a transform into a mesh object's vertices and reset the object's
+    transform; replaces bpy.ops.object.transform_apply for a single object.
+    
+    `matrix` defaults to the object's own loc/rot/scale (matrix_basis, which
+    unlike matrix_world is current without a depsgraph update).
+    """
+    if matrix is None:
+        matrix = obj.matrix_basis.copy()
+    mesh = obj.data
+    if mesh.users > 1:
+        # Don't move other objects sharing this mesh
+        mesh = obj.data = mesh.copy()
+    
+    # Mesh.transform runs over all vertices in C
+    mesh.transform(matrix)
+    mesh.update()
+    
+    obj.matrix_basis = Matrix.Identity(4)
+
+def delete_loose(bm):
+    """bmesh equivalent of edit-mode mesh.delete_loose (loose edges and verts)"""
+    # Imported walls are almost always clean; skip the delete ops then
+    loose_edges = [e for e in bm.edges if not e.link_faces]
+    if loose_edges:
+        bmesh.ops.delete(bm, geom=loose_edges, context='EDGES')
+    loose_verts = [v for v in bm.verts if not v.link_edges]
+    if loose_verts:
+        bmesh.ops.delete(bm, geom=loose_verts, context='VERTS')
+
 # ============================================================================
 # STEP 0: SCENE INITIALIZATION
 # ============================================================================
@@ -82,15 +131,11 @@ def clear_scene():
     """Remove all default objects and data"""
     log("Clearing scene", "STEP")
     
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
-    for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj)
+    # One batched free instead of per-datablock removes (each of which
+    # re-scans user counts)
+    ids = list(bpy.data.objects) + list(bpy.data.meshes) + list(bpy.data.materials)
+    if ids:
+        bpy.data.batch_remove(ids=ids)
 
 def configure_scene_units():
     """Set up Blender for metric modeling"""
@@ -121,34 +166,62 @@ def import_glb(filepath):
     log(f"  Imported {len(imported)} objects", "INFO")
     return imported
 
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _transform_bounds_jit(mats, corners):
+        """Fused corner transform + min/max per object, without the (N, 8, 3) temporary"""
+        n = corners.shape[0]
+        mins = np.empty((n, 3))
+        maxs = np.empty((n, 3))
+        for i in prange(n):
+            for a in range(3):
+                lo = np.inf
+                hi = -np.inf
+                for k in range(8):
+                    v = mats[i, a, 3]
+                    for b in range(3):
+                        v += mats[i, a, b] * corners[i, k, b]
+                    lo = min(lo, v)
+                    hi = max(hi, v)
+                mins[i, a] = lo
+                maxs[i, a] = hi
+        return mins, maxs
+
+def world_bbox_arrays(objects):
+    """
+    Per-object world-space bounding boxes as two (N, 3) arrays (mins, maxs).
+
+    All local bound-box corners are transformed in one go:
+    (N, 4, 4) matrices x (N, 8, 3) corners -> (N, 8, 3).
+    """
+    mats = np.array([obj.matrix_world for obj in objects], dtype=np.float64).reshape(-1, 4, 4)
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float64).reshape(-1, 8, 3)
+    if njit is not None:
+        return _transform_bounds_jit(mats, corners)
+    world = np.einsum('nij,nkj->nki', mats[:, :3, :3], corners) + mats[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
 def analyze_geometry_bounds(objects):
-    """Analyze bounding box of imported geometry"""
+    """
+    Analyze bounding box of imported geometry.
+    
+    Besides the overall box, the result keeps the per-object world boxes
+    ('objects', 'mins', 'maxs') so later steps don't have to measure again.
+    """
     log("Analyzing geometry bounds", "STEP")
     
     if not objects:
         log("No objects to analyze", "WARN")
         return None
     
-    all_corners = []
-    for obj in objects:
-        if hasattr(obj, 'bound_box'):
-            corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-            all_corners.extend(corners)
-    
-    if not all_corners:
+    boxed = [obj for obj in objects if hasattr(obj, 'bound_box')]
+    if not boxed:
         log("Could not extract bounding box", "WARN")
         return None
     
-    min_pt = Vector((
-        min(p.x for p in all_corners),
-        min(p.y for p in all_corners),
-        min(p.z for p in all_corners)
-    ))
-    max_pt = Vector((
-        max(p.x for p in all_corners),
-        max(p.y for p in all_corners),
-        max(p.z for p in all_corners)
-    ))
+    mins, maxs = world_bbox_arrays(boxed)
+    min_pt = Vector(mins.min(axis=0))
+    max_pt = Vector(maxs.max(axis=0))
     
     size = max_pt - min_pt
     center = (min_pt + max_pt) / 2
@@ -161,7 +234,10 @@ def analyze_geometry_bounds(objects):
         'max': max_pt,
         'center': center,
         'size': size,
-        'dominant_dim': dominant_dim
+        'dominant_dim': dominant_dim,
+        'objects': boxed,
+        'mins': mins,
+        'maxs': maxs
     }
     
     log(f"  Size: X={size.x:.3f}, Y={size.y:.3f}, Z={size.z:.3f}", "INFO")
@@ -185,151 +261,153 @@ def compute_metric_scale(bounds):
     return scale
 
 def apply_metric_normalization(objects, bounds, scale):
-    """Apply global scale and center geometry"""
+    """
+    Apply global scale and center geometry (`bounds` are the pre-scale bounds).
+    
+    Returns the per-object world boxes after normalization as
+    (objects, mins, maxs), or None if there were no bounds to carry over.
+    """
     log("Applying metric normalization", "STEP")
     
     if not objects:
         log("No objects to normalize", "WARN")
-        return
+        return None
     
     log(f"  Scaling all geometry by {scale:.6f}x", "INFO")
     
-    # Create parent for uniform scaling
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-    scale_parent = bpy.context.active_object
-    scale_parent.name = "MetricScaler"
-    
-    # Parent objects
-    for obj in objects:
-        obj.parent = scale_parent
-    
-    # Apply scale
-    scale_parent.scale = (scale, scale, scale)
+    # Shift to Z=0. Scaling is about the origin, so the scaled floor sits at
+    # the pre-scale min Z times the scale; no need to re-measure
+    z_offset = -bounds['min'].z * scale if bounds else 0.0
+    log(f"  Shifting geometry up by {z_offset:.3f}m to place floor at Z=0", "INFO")
     
-    bpy.context.view_layer.objects.active = scale_parent
-    bpy.ops.object.transform_apply(scale=True)
-    
-    # Unparent
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in objects:
-        obj.select_set(True)
+    # Scale + shift as one matrix, baked straight into each mesh's vertices
+    normalize = Matrix.Translation((0.0, 0.0, z_offset)) @ Matrix.Scale(scale, 4)
+    world_matrices = [obj.matrix_world.copy() for obj in objects]
+    for obj, world in zip(objects, world_matrices):
         obj.parent = None
+        if obj.type == 'MESH':
+            bake_matrix(obj, normalize @ world)
+        else:
+            obj.matrix_world = normalize @ world
     
-    bpy.data.objects.remove(scale_parent, do_unlink=True)
-    
-    # Shift to Z=0
-    new_bounds = analyze_geometry_bounds(objects)
-    if new_bounds:
-        z_offset = -new_bounds['min'].z
-        log(f"  Shifting geometry up by {z_offset:.3f}m to place floor at Z=0", "INFO")
-        
-        for obj in objects:
-            obj.location.z += z_offset
+    # Refresh matrix_world / bound_box once for the steps that read them
+    bpy.context.view_layer.update()
     
     log(f"  Normalization complete: 1 unit = 1 meter", "INFO")
+    
+    if bounds is None:
+        return None
+    # A uniform scale plus a Z shift maps axis-aligned boxes onto
+    # axis-aligned boxes, so the measured bounds carry over exactly
+    offset = np.array((0.0, 0.0, z_offset))
+    return bounds['objects'], bounds['mins'] * scale + offset, bounds['maxs'] * scale + offset
 
 # ============================================================================
 # STEP 2: OPEN-TOP WALL CONSTRUCTION
 # ============================================================================
 
-def extract_walls(objects):
-    """Extract wall geometry"""
+def extract_walls(objects, precomputed_bounds=None):
+    """
+    Extract wall geometry.
+
+    Returns (walls, footprints); footprints is an (N, 4) array of each wall's
+    XY extent (min x, min y, max x, max y) for vectorized per-wall queries.
+    `precomputed_bounds` is the (objects, mins, maxs) result of
+    apply_metric_normalization; without it the bounds are measured here.
+    """
     log("Extracting wall geometry", "STEP")
     
+    if precomputed_bounds is not None:
+        boxed, mins, maxs = precomputed_bounds
+        is_mesh = np.array([obj.type == 'MESH' for obj in boxed], dtype=bool)
+        meshes = [obj for obj in boxed if obj.type == 'MESH']
+        mins, maxs = mins[is_mesh], maxs[is_mesh]
+    else:
+        meshes = [obj for obj in objects if obj.type == 'MESH']
+        mins, maxs = world_bbox_arrays(meshes)
+    sizes = maxs - mins
+    centers = (mins + maxs) / 2
+    
     walls = []
-    for obj in objects:
-        if obj.type == 'MESH':
-            bbox_corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            min_pt = Vector((min(p.x for p in bbox_corners),
-                           min(p.y for p in bbox_corners),
-                           min(p.z for p in bbox_corners)))
-            max_pt = Vector((max(p.x for p in bbox_corners),
-                           max(p.y for p in bbox_corners),
-                           max(p.z for p in bbox_corners)))
-            
-            size = max_pt - min_pt
-            center = (min_pt + max_pt) / 2
-            
-            walls.append({
-                'obj': obj,
-                'center': center,
-                'bounds': {'min': min_pt, 'max': max_pt},
-                'size': size
-            })
+    for obj, min_pt, max_pt, size, center in zip(meshes, mins, maxs, sizes, centers):
+        walls.append({
+            'obj': obj,
+            'center': Vector(center),
+            'bounds': {'min': Vector(min_pt), 'max': Vector(max_pt)},
+            'size': Vector(size)
+        })
     
     log(f"  Found {len(walls)} wall objects", "INFO")
-    return walls
+    return walls, np.hstack((mins[:, :2], maxs[:, :2]))
 
-def add_wall_thickness_cutaway(walls):
-    """Add wall thickness for open-top visualization"""
-    log(f"Adding wall thickness ({WALL_THICKNESS_M}m)", "STEP")
+def shape_walls(walls):
+    """
+    Give walls their thickness and open-top height in one bmesh pass per wall.
     
-    for i, wall_info in enumerate(walls):
-        obj = wall_info['obj']
-        
-        # Clean geometry
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.delete_loose()
-        bpy.ops.object.mode_set(mode='OBJECT')
-        
-        # Add Solidify modifier
-        solidify = obj.modifiers.new(name='Solidify', type='SOLIDIFY')
-        solidify.thickness = WALL_THICKNESS_M
-        solidify.offset = 0.0
-        
-        # Apply modifier
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.modifier_apply(modifier='Solidify')
-        
-        log(f"  Wall {i}: thickness applied", "INFO")
-
-def extrude_walls_to_cutaway_height(walls):
-    """Extrude walls to open-top visualization height (1.2-1.5m)"""
-    log(f"Extruding walls to open-top height {WALL_HEIGHT_CUTAWAY_M}m", "STEP")
+    Replaces the separate Solidify (offset 0) and Z-extrude passes: normals
+    are made consistent, loose geometry dropped, the shell solidified about
+    the original surface, then the wall scaled to the open-top height with its
+    base at Z=0, with a single write back to the mesh.
+    """
+    log(f"Shaping walls: thickness {WALL_THICKNESS_M}m, open-top height {WALL_HEIGHT_CUTAWAY_M}m", "STEP")
+    
+    half_thickness = WALL_THICKNESS_M / 2
     
     for i, wall_info in enumerate(walls):
         obj = wall_info['obj']
         size = wall_info['size']
         
-        current_z = max(size.z, 0.1)
-        z_scale = WALL_HEIGHT_CUTAWAY_M / current_z
+        mesh = obj.data
+        if mesh.users > 1:
+            mesh = obj.data = mesh.copy()
         
-        # Position wall
-        target_z = WALL_HEIGHT_CUTAWAY_M / 2
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        
+        # Clean geometry
+        delete_loose(bm)
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
         
-        obj.scale.z = z_scale
-        obj.location.z = target_z
+        # bmesh solidify pushes the new shell inward by the full thickness;
+        # move the surface out by half first so the wall is centred on it
+        # like the Solidify modifier with offset=0
+        bm.normal_update()
+        for v in bm.verts:
+            v.co += v.normal * half_thickness
+        bmesh.ops.solidify(bm, geom=list(bm.faces), thickness=WALL_THICKNESS_M)
         
-        # Apply transforms
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        # Extrude to open-top height. Normalization baked the world transform
+        # into the vertices (origin at world 0), so scale Z about the wall's
+        # own base and drop that base onto the floor at Z=0
+        z_scale = WALL_HEIGHT_CUTAWAY_M / max(size.z, 0.1)
+        min_z = wall_info['bounds']['min'].z
+        extrude = Matrix.Diagonal((1.0, 1.0, z_scale, 1.0))
+        extrude[2][3] = -min_z * z_scale
+        bmesh.ops.transform(bm, matrix=extrude, verts=bm.verts)
         
-        log(f"  Wall {i}: extruded to {WALL_HEIGHT_CUTAWAY_M}m (open-top)", "INFO")
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+        
+        log(f"  Wall {i}: thickness applied, extruded to {WALL_HEIGHT_CUTAWAY_M}m (open-top)", "INFO")
 
 # ============================================================================
 # STEP 3: FLOOR SLAB GENERATION
 # ============================================================================
 
-def create_floor_slab(walls):
-    """Create single floor slab at Z=0"""
+def create_floor_slab(all_min, all_max):
+    """
+    Create single floor slab at Z=0 under the building footprint
+    (`all_min`/`all_max`: XY extent of all walls, None if there are none)
+    """
     log("Creating floor slab", "STEP")
     
-    if not walls:
+    if all_min is None:
         log("No walls to generate floor from", "WARN")
         return None
     
-    # Calculate building footprint
-    all_x = []
-    all_y = []
-    for wall_info in walls:
-        bounds = wall_info['bounds']
-        all_x.extend([bounds['min'].x, bounds['max'].x])
-        all_y.extend([bounds['min'].y, bounds['max'].y])
-    
-    min_x, max_x = min(all_x), max(all_x)
-    min_y, max_y = min(all_y), max(all_y)
+    min_x, min_y = all_min.tolist()
+    max_x, max_y = all_max.tolist()
     
     floor_center_x = (min_x + max_x) / 2
     floor_center_y = (min_y + max_y) / 2
@@ -339,16 +417,20 @@ def create_floor_slab(walls):
     # Create floor slab (slightly below Z=0 so its top surface is at Z=0)
     floor_z = -FLOOR_THICKNESS_M / 2
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(floor_center_x, floor_center_y, floor_z)
+    # Build the box directly in mesh data (no operator / undo push), with the
+    # same size, placement and UVs primitive_cube_add + transform_apply gave
+    bm = bmesh.new()
+    bm.loops.layers.uv.new("UVMap")
+    bmesh.ops.create_cube(
+        bm, size=1.0, calc_uvs=True,
+        matrix=Matrix.Translation((floor_center_x, floor_center_y, floor_z))
+        @ Matrix.Diagonal((floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2, 1.0))
     )
-    floor_obj = bpy.context.active_object
-    floor_obj.name = "FloorSlab"
-    floor_obj.scale = (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
-    
-    bpy.context.view_layer.objects.active = floor_obj
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+    floor_mesh = bpy.data.meshes.new("FloorSlab")
+    bm.to_mesh(floor_mesh)
+    bm.free()
+    floor_obj = bpy.data.objects.new("FloorSlab", floor_mesh)
+    bpy.context.scene.collection.objects.link(floor_obj)
     
     log(f"  Floor slab created: {floor_width:.2f}m x {floor_depth:.2f}m", "INFO")
     
@@ -358,92 +440,164 @@ def create_floor_slab(walls):
 # STEP 4: SIMPLIFIED OPENINGS (RECTANGULAR CUTS ONLY)
 # ============================================================================
 
-def create_door_openings_simplified(walls):
-    """Create simple rectangular door openings"""
+def create_door_openings_simplified(walls, footprints, cutters):
+    """Plan simple rectangular door openings (boxes appended to `cutters[i]`)"""
     log(f"Creating door openings ({DOOR_WIDTH_M}m x {DOOR_HEIGHT_CUTAWAY_M}m)", "STEP")
     
-    doors_created = 0
+    # Door at center-bottom of wall; cutter sizes are the same for every wall
+    door_z = DOOR_HEIGHT_CUTAWAY_M / 2
+    door_dim_x = DOOR_WIDTH_M/2 + 0.02
+    door_dim_z = DOOR_HEIGHT_CUTAWAY_M/2
+    
+    # Only add doors to sufficiently large walls
+    extents = footprints[:, 2:] - footprints[:, :2]
+    doored = np.flatnonzero((extents[:, 0] > DOOR_WIDTH_M) & (extents[:, 1] > DOOR_WIDTH_M)).tolist()
+    
+    for i in doored:
+        center = walls[i]['center']
+        size = walls[i]['size']
+        
+        # Simple rectangular cutter: (location, dimensions)
+        cutters[i].append((
+            (center.x, center.y, door_z),
+            (door_dim_x, size.y/2 + 0.1, door_dim_z)
+        ))
+    
+    if doored:
+        log(f"  Door openings added to walls {doored}", "INFO")
+    log(f"  Total door openings: {len(doored)}", "INFO")
+
+def create_window_openings_simplified(walls, footprints, cutters):
+    """Plan simple rectangular window openings (boxes appended to `cutters[i]`)"""
+    log(f"Creating window openings ({WINDOW_WIDTH_M}m x {WINDOW_HEIGHT_M}m @ {WINDOW_SILL_HEIGHT_M}m)", "STEP")
+    
+    window_z = WINDOW_SILL_HEIGHT_M + WINDOW_HEIGHT_M / 2
+    window_dim_x = WINDOW_WIDTH_M/2 + 0.02
+    window_dim_z = WINDOW_HEIGHT_M/2
+    min_wall_x = WINDOW_WIDTH_M * 2
+    
+    windowed = np.flatnonzero(footprints[:, 2] - footprints[:, 0] > min_wall_x).tolist()
+    
+    for i in windowed:
+        center = walls[i]['center']
+        size = walls[i]['size']
+        
+        # Create 2 windows per wall, a quarter of the wall in from its center
+        quarter = size.x/4
+        dims = (window_dim_x, size.y/2 + 0.1, window_dim_z)
+        for x_offset in (-quarter, quarter):
+            cutters[i].append(((center.x + x_offset, center.y, window_z), dims))
+    
+    log(f"  Total window openings: {2 * len(windowed)}", "INFO")
+
+def _boxes_overlap(a, b):
+    """True if two (location, dimensions) boxes intersect"""
+    (ca, da), (cb, db) = a, b
+    return all(abs(ca[k] - cb[k]) < (da[k] + db[k]) / 2 for k in range(3))
+
+def _has_degenerate_faces(mesh):
+    """True if any face of the mesh has (near) zero area"""
+    areas = np.empty(len(mesh.polygons), dtype=np.float32)
+    mesh.polygons.foreach_get("area", areas)
+    return bool((areas < DEGENERATE_FACE_AREA).any())
+
+def _swap_mesh(obj, new_mesh):
+    """Replace an object's mesh with its evaluated copy and drop the modifier stack"""
+    old_mesh = obj.data
+    obj.modifiers.clear()
+    obj.data = new_mesh
+    if old_mesh.users == 0:
+        bpy.data.meshes.remove(old_mesh)
+    new_mesh.name = obj.name
+
+def apply_opening_cutters(walls, cutters):
+    """
+    Cut all planned openings of each wall with a single boolean.
+    
+    A wall's door and window boxes are written into one cutter mesh with
+    bmesh, so each wall gets one boolean instead of one per opening.
+    Boxes that overlap go into a separate batch, since the MANIFOLD solver
+    needs a cutter without self-intersections.
+    
+    The booleans of every wall are stacked first and then resolved in a
+    single depsgraph evaluation, reading each result back with
+    new_from_object instead of one modifier_apply per boolean.
+    
+    Walls under FAST_BOOLEAN_MAX_FACES faces are cut with the FAST solver;
+    any of those whose result has zero-area faces are re-cut with MANIFOLD.
+    """
+    log("Cutting openings (one boolean per wall)", "STEP")
+    
+    booleans = 0
+    scene_collection = bpy.context.scene.collection
+    cut_walls = []
+    cutter_objs = []
     
     for i, wall_info in enumerate(walls):
+        boxes = cutters[i]
+        if not boxes:
+            continue
         wall_obj = wall_info['obj']
-        center = wall_info['center']
-        size = wall_info['size']
+        solver = 'FAST' if len(wall_obj.data.polygons) < FAST_BOOLEAN_MAX_FACES else 'MANIFOLD'
         
-        # Only add doors to sufficiently large walls
-        if size.x > DOOR_WIDTH_M and size.y > DOOR_WIDTH_M:
-            # Door at center-bottom of wall
-            door_z = DOOR_HEIGHT_CUTAWAY_M / 2
-            
-            # Create simple rectangular cutter
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=(center.x, center.y, door_z)
-            )
-            door_cutter = bpy.context.active_object
-            door_cutter.name = f"DoorCutter_{i}"
-            door_cutter.scale = (DOOR_WIDTH_M/2 + 0.02, size.y/2 + 0.1, DOOR_HEIGHT_CUTAWAY_M/2)
-            
-            bpy.context.view_layer.objects.active = door_cutter
-            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        batches = []
+        for box in boxes:
+            for batch in batches:
+                if not any(_boxes_overlap(box, other) for other in batch):
+                    batch.append(box)
+                    break
+            else:
+                batches.append([box])
+        
+        for b_idx, batch in enumerate(batches):
+            bm = bmesh.new()
+            for location, dims in batch:
+                bmesh.ops.create_cube(
+                    bm, size=1.0,
+                    matrix=Matrix.Translation(location) @ Matrix.Diagonal((*dims, 1.0))
+                )
+            cutter_mesh = bpy.data.meshes.new(f"OpeningCutter_{i}_{b_idx}")
+            bm.to_mesh(cutter_mesh)
+            bm.free()
+            cutter = bpy.data.objects.new(cutter_mesh.name, cutter_mesh)
+            scene_collection.objects.link(cutter)
             
-            # Boolean difference
-            bool_mod = wall_obj.modifiers.new(name=f'DoorBool_{i}', type='BOOLEAN')
+            bool_mod = wall_obj.modifiers.new(name=f'OpeningBool_{i}_{b_idx}', type='BOOLEAN')
             bool_mod.operation = 'DIFFERENCE'
-            bool_mod.object = door_cutter
-            bool_mod.solver = 'MANIFOLD'
-            
-            bpy.context.view_layer.objects.active = wall_obj
-            bpy.ops.object.modifier_apply(modifier=f'DoorBool_{i}')
-            
-            bpy.data.objects.remove(door_cutter, do_unlink=True)
+            bool_mod.object = cutter
+            bool_mod.solver = solver
             
-            doors_created += 1
-            log(f"  Door opening added to wall {i}", "INFO")
+            cutter_objs.append(cutter)
+            booleans += 1
+        cut_walls.append(wall_obj)
+    
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    retry = []
+    for wall_obj in cut_walls:
+        new_mesh = bpy.data.meshes.new_from_object(
+            wall_obj.evaluated_get(depsgraph), preserve_all_data_layers=False, depsgraph=depsgraph
+        )
+        if wall_obj.modifiers[0].solver == 'FAST' and _has_degenerate_faces(new_mesh):
+            bpy.data.meshes.remove(new_mesh)
+            for mod in wall_obj.modifiers:
+                mod.solver = 'MANIFOLD'
+            retry.append(wall_obj)
+            continue
+        _swap_mesh(wall_obj, new_mesh)
     
-    log(f"  Total door openings: {doors_created}", "INFO")
-
-def create_window_openings_simplified(walls):
-    """Create simple rectangular window openings"""
-    log(f"Creating window openings ({WINDOW_WIDTH_M}m x {WINDOW_HEIGHT_M}m @ {WINDOW_SILL_HEIGHT_M}m)", "STEP")
+    if retry:
+        log(f"  Re-cutting {len(retry)} wall(s) with MANIFOLD", "WARN")
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        for wall_obj in retry:
+            _swap_mesh(wall_obj, bpy.data.meshes.new_from_object(
+                wall_obj.evaluated_get(depsgraph), preserve_all_data_layers=False, depsgraph=depsgraph
+            ))
     
-    windows_created = 0
+    cutter_meshes = [c.data for c in cutter_objs]
+    bpy.data.batch_remove(cutter_objs)
+    bpy.data.batch_remove(cutter_meshes)
     
-    for i, wall_info in enumerate(walls):
-        wall_obj = wall_info['obj']
-        center = wall_info['center']
-        size = wall_info['size']
-        
-        if size.x > WINDOW_WIDTH_M * 2:
-            # Create 2 windows per wall
-            for w_idx in range(2):
-                x_offset = -size.x/4 if w_idx == 0 else size.x/4
-                window_z = WINDOW_SILL_HEIGHT_M + WINDOW_HEIGHT_M / 2
-                
-                # Simple rectangular cutter
-                bpy.ops.mesh.primitive_cube_add(
-                    size=1,
-                    location=(center.x + x_offset, center.y, window_z)
-                )
-                window_cutter = bpy.context.active_object
-                window_cutter.name = f"WindowCutter_{i}_{w_idx}"
-                window_cutter.scale = (WINDOW_WIDTH_M/2 + 0.02, size.y/2 + 0.1, WINDOW_HEIGHT_M/2)
-                
-                bpy.context.view_layer.objects.active = window_cutter
-                bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-                
-                # Boolean
-                bool_mod = wall_obj.modifiers.new(name=f'WindowBool_{i}_{w_idx}', type='BOOLEAN')
-                bool_mod.operation = 'DIFFERENCE'
-                bool_mod.object = window_cutter
-                bool_mod.solver = 'MANIFOLD'
-                
-                bpy.context.view_layer.objects.active = wall_obj
-                bpy.ops.object.modifier_apply(modifier=f'WindowBool_{i}_{w_idx}')
-                
-                bpy.data.objects.remove(window_cutter, do_unlink=True)
-                windows_created += 1
-    
-    log(f"  Total window openings: {windows_created}", "INFO")
+    log(f"  Applied {booleans} boolean(s) for {sum(len(c) for c in cutters)} openings", "INFO")
 
 # ============================================================================
 # STEP 5: VISUAL CLEANUP
@@ -453,17 +607,22 @@ def fix_normals_and_shading(objects):
     """Recalculate normals and apply auto-smooth"""
     log("Fixing normals and shading", "STEP")
     
+    # Work on mesh data directly: no edit-mode round trip or operator
+    # depsgraph update per object
     for obj in objects:
         if obj.type != 'MESH':
             continue
         
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.shade_smooth()
+        mesh = obj.data
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        bm.to_mesh(mesh)
+        bm.free()
         
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Equivalent of shade_smooth()
+        mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+        mesh.update()
     
     log(f"  Normals recalculated for {len(objects)} objects", "INFO")
 
@@ -472,16 +631,25 @@ def fix_normals_and_shading(objects):
 # ============================================================================
 
 def create_architectural_material(name, color_rgb, roughness=0.75):
-    """Create matte architectural material for diagrams"""
-    mat = bpy.data.materials.new(name=name)
+    """Create (or reuse by name) a matte architectural material for diagrams"""
+    mat = bpy.data.materials.get(name) or bpy.data.materials.new(name=name)
     mat.use_nodes = True
     bsdf = mat.node_tree.nodes.get("Principled BSDF")
     if bsdf:
-        bsdf.inputs['Base Color'].default_value = (*color_rgb, 1.0)
-        bsdf.inputs['Roughness'].default_value = roughness
-        bsdf.inputs['Metallic'].default_value = 0.0
+        # Look the sockets up once, then set them
+        base_color, rough, metallic = (bsdf.inputs[k] for k in ('Base Color', 'Roughness', 'Metallic'))
+        base_color.default_value = (*color_rgb, 1.0)
+        rough.default_value = roughness
+        metallic.default_value = 0.0
     return mat
 
+def assign_single_material(obj, mat):
+    """Give a mesh exactly one material slot holding `mat`, used by every face"""
+    mesh = obj.data
+    mesh.materials.clear()
+    mesh.materials.append(mat)
+    mesh.polygons.foreach_set("material_index", np.zeros(len(mesh.polygons), dtype=np.int32))
+
 def assign_architectural_materials(walls, floor):
     """Assign high-contrast materials for architectural readability"""
     log("Assigning architectural materials", "STEP")
@@ -490,20 +658,13 @@ def assign_architectural_materials(walls, floor):
     mat_walls = create_architectural_material("Walls", COLOR_WALLS_RGB, MATERIAL_ROUGHNESS)
     mat_floor = create_architectural_material("FloorMaterial", COLOR_FLOOR_RGB, MATERIAL_ROUGHNESS)
     
-    # Assign to walls
+    # Assign to walls (one shared datablock)
     for wall_info in walls:
-        obj = wall_info['obj']
-        if obj.data.materials:
-            obj.data.materials[0] = mat_walls
-        else:
-            obj.data.materials.append(mat_walls)
+        assign_single_material(wall_info['obj'], mat_walls)
     
     # Assign to floor
     if floor:
-        if floor.data.materials:
-            floor.data.materials[0] = mat_floor
-        else:
-            floor.data.materials.append(mat_floor)
+        assign_single_material(floor, mat_floor)
     
     log(f"  Wall color: RGB{COLOR_WALLS_RGB}", "INFO")
     log(f"  Floor color: RGB{COLOR_FLOOR_RGB}", "INFO")
@@ -512,18 +673,13 @@ def assign_architectural_materials(walls, floor):
 # STEP 7: CUTAWAY CAMERA & LIGHTING
 # ============================================================================
 
-def add_cutaway_camera_and_lighting(walls):
-    """Add top-down angled camera and soft directional lighting"""
+def add_cutaway_camera_and_lighting(center_x, center_y, max_size):
+    """
+    Add top-down angled camera and soft directional lighting around the
+    scene center (mean wall center), framed by the widest wall `max_size`
+    """
     log("Adding cutaway camera and lighting", "STEP")
     
-    # Calculate scene center
-    if walls:
-        center_x = sum(w['center'].x for w in walls) / len(walls)
-        center_y = sum(w['center'].y for w in walls) / len(walls)
-        max_size = max(w['size'].x for w in walls)
-    else:
-        center_x, center_y, max_size = 0, 0, 10
-    
     # Position camera above at 45° angle for cutaway view
     camera_distance = max_size * 1.2
     camera_height = WALL_HEIGHT_CUTAWAY_M * 1.8  # Well above walls
@@ -540,9 +696,7 @@ def add_cutaway_camera_and_lighting(walls):
     
     # Point at scene center, slightly below camera for open-top view
     look_target = Vector((center_x, center_y, WALL_HEIGHT_CUTAWAY_M * 0.5))
-    direction = look_target - Vector(camera.location)
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    camera.rotation_euler = rot_quat.to_euler()
+    camera.rotation_euler = (look_target - camera.location).to_track_quat('-Z', 'Y').to_euler()
     
     # Use orthographic for architectural diagram look (optional)
     # camera.data.type = 'ORTHO'
@@ -571,13 +725,30 @@ def export_to_glb(filepath):
     """Export as GLB with Draco compression"""
     log(f"Exporting to {filepath}", "STEP")
     
-    bpy.ops.object.select_all(action='SELECT')
-    
+    # Whole scene, no selection pass; flat-shaded static walls need no
+    # skins, morphs, animation or tangents
     try:
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            export_format='GLB'
-        )
+        try:
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                export_format='GLB',
+                use_selection=False,
+                export_apply=True,
+                export_draco_mesh_compression_enable=True,
+                export_draco_mesh_compression_level=6,
+                export_skins=False,
+                export_morph=False,
+                export_tangents=False,
+                export_animations=False,
+                export_lights=True,
+                export_cameras=True
+            )
+        except TypeError:
+            # Option names differ between exporter versions
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                export_format='GLB'
+            )
         log(f"  Export successful", "INFO")
     except Exception as e:
         log(f"  Export error: {e}", "WARN")
@@ -613,19 +784,25 @@ def main():
         imported = import_glb(input_glb)
         bounds = analyze_geometry_bounds(imported)
         scale = compute_metric_scale(bounds)
-        apply_metric_normalization(imported, bounds, scale)
+        object_bounds = apply_metric_normalization(imported, bounds, scale)
         
         # STEP 2: Open-Top Walls
-        walls = extract_walls(imported)
-        add_wall_thickness_cutaway(walls)
-        extrude_walls_to_cutaway_height(walls)
+        walls, footprints = extract_walls(imported, object_bounds)
+        shape_walls(walls)
         
         # STEP 3: Floor Slab
-        floor = create_floor_slab(walls)
+        if walls:
+            all_min = footprints[:, :2].min(axis=0)
+            all_max = footprints[:, 2:].max(axis=0)
+        else:
+            all_min = all_max = None
+        floor = create_floor_slab(all_min, all_max)
         
         # STEP 4: Simplified Openings
-        create_door_openings_simplified(walls)
-        create_window_openings_simplified(walls)
+        cutters = [[] for _ in walls]
+        create_door_openings_simplified(walls, footprints, cutters)
+        create_window_openings_simplified(walls, footprints, cutters)
+        apply_opening_cutters(walls, cutters)
         
         # STEP 5: Visual Cleanup
         all_objs = [w['obj'] for w in walls] + ([floor] if floor else [])
@@ -635,7 +812,12 @@ def main():
         assign_architectural_materials(walls, floor)
         
         # STEP 7: Cutaway Camera & Lighting
-        add_cutaway_camera_and_lighting(walls)
+        if walls:
+            center_x, center_y = ((footprints[:, :2] + footprints[:, 2:]) / 2).mean(axis=0).tolist()
+            max_size = float((footprints[:, 2] - footprints[:, 0]).max())
+        else:
+            center_x, center_y, max_size = 0, 0, 10
+        add_cutaway_camera_and_lighting(center_x, center_y, max_size)
         
         # STEP 8: Export
         export_to_glb(output_glb)
@@ -19,14 +19,30 @@ MANDATORY PIPELINE (STRICT ORDER):
 8. Export (Zero-Adjustment)
 
 Usage:
-blender --background --python convert_to_cutaway_prod.py -- input.glb output.glb
+blender --background --python convert_to_cutaway_prod.py -- input.glb output.glb [--workers N]
+
+With --workers N (N > 1) the opening cuts are spread over N background
+Blender processes.
 """
 
 import bpy
+import bmesh
+import json
+import subprocess
 import sys
 import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from mathutils import Vector, Matrix
 import math
+import numpy as np
+
+# Numba is not bundled with Blender; JIT the footprint kernel when the
+# Python environment has it, otherwise stay on plain NumPy
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 # ============================================================================
 # PRODUCTION CONFIGURATION
@@ -59,6 +75,17 @@ COLOR_WALLS_RGB = (0.92, 0.85, 0.74)  # Warm beige
 COLOR_FLOOR_RGB = (0.45, 0.45, 0.48)  # Dark neutral gray
 MATERIAL_ROUGHNESS = 0.75  # Matte architectural finish
 
+# Derived values, folded once instead of recomputed per wall/call
+_FLOOR_HALF_T = FLOOR_THICKNESS_M / 2
+_DOOR_Z = DOOR_HEIGHT_CUTAWAY_M / 2
+_DOOR_CUTTER_W = DOOR_WIDTH_M/2 + 0.02
+_DOOR_CUTTER_H = DOOR_HEIGHT_CUTAWAY_M/2
+_WINDOW_Z = WINDOW_SILL_HEIGHT_M + WINDOW_HEIGHT_M / 2
+_WINDOW_CUTTER_W = WINDOW_WIDTH_M/2 + 0.02
+_WINDOW_CUTTER_H = WINDOW_HEIGHT_M/2
+_MIN_WINDOW_WALL_X = WINDOW_WIDTH_M * 2
+_SUN_ANGLE_RAD = math.radians(8)  # Soft shadows
+
 # ============================================================================
 # VALIDATION FRAMEWORK
 # ============================================================================
@@ -125,16 +152,86 @@ class ValidationReport:
 # LOGGING & UTILITIES
 # ============================================================================
 
+_LOG_PREFIX = {
+    "INFO": "[Cutaway:INFO]",
+    "STEP": "[Cutaway:STEP]",
+    "WARN": "[Cutaway:WARN]",
+    "ERR": "[Cutaway:ERROR]",
+    "VALID": "[Cutaway:VALID]"
+}
+_LOG_BUF = []
+
 def log(msg, level="INFO"):
-    """Production logging"""
-    prefix = {
-        "INFO": "[Cutaway:INFO]",
-        "STEP": "[Cutaway:STEP]",
-        "WARN": "[Cutaway:WARN]",
-        "ERR": "[Cutaway:ERROR]",
-        "VALID": "[Cutaway:VALID]"
-    }.get(level, "[Cutaway]")
-    print(f"{prefix} {msg}")
+    """
+    Production logging. Lines are buffered and written in one go when a
+    new stage starts (STEP) or on an error, instead of one write per line
+    in the per-wall loops.
+    """
+    _LOG_BUF.append(f"{_LOG_PREFIX.get(level, '[Cutaway]')} {msg}")
+    if level in ("STEP", "ERR"):
+        flush_log()
+
+def flush_log():
+    """Write out buffered log lines"""
+    if _LOG_BUF:
+        sys.stdout.write("\n".join(_LOG_BUF) + "\n")
+        sys.stdout.flush()
+        _LOG_BUF.clear()
+
+# Unit cube corners (index = x + 2y + 4z) and outward-facing quads
+_BOX_CORNERS = [(x, y, z) for z in (-0.5, 0.5) for y in (-0.5, 0.5) for x in (-0.5, 0.5)]
+_BOX_FACES = [(0, 2, 3, 1), (4, 5, 7, 6), (0, 1, 5, 4), (2, 6, 7, 3), (0, 4, 6, 2), (1, 3, 7, 5)]
+
+def fill_box_mesh(mesh, boxes):
+    """Replace a mesh's geometry with axis-aligned boxes given as (center, dimensions)"""
+    verts = []
+    faces = []
+    for (cx, cy, cz), (dx, dy, dz) in boxes:
+        base = len(verts)
+        verts.extend((cx + x*dx, cy + y*dy, cz + z*dz) for x, y, z in _BOX_CORNERS)
+        faces.extend(tuple(base + k for k in face) for face in _BOX_FACES)
+    mesh.clear_geometry()
+    mesh.from_pydata(verts, [], faces)
+    mesh.update()
+    return mesh
+
+def make_box_mesh(name, boxes):
+    """Mesh of axis-aligned boxes given as (center, dimensions), built in world coordinates"""
+    return fill_box_mesh(bpy.data.meshes.new(name), boxes)
+
+def bake_transform(obj):
+    """
+    Bake an object's loc/rot/scale into its mesh and reset it to identity;
+    the single-object equivalent of transform_apply(location, rotation, scale)
+    """
+    mesh = obj.data
+    if mesh.users > 1:
+        # Don't move other objects sharing this mesh
+        mesh = obj.data = mesh.copy()
+    mesh.transform(obj.matrix_basis)
+    mesh.update()
+    obj.matrix_basis = Matrix.Identity(4)
+
+def apply_modifier(obj, modifier_name):
+    """Apply one modifier under a temporary context instead of changing the active object"""
+    with bpy.context.temp_override(object=obj, active_object=obj,
+                                   selected_objects=[obj], selected_editable_objects=[obj]):
+        bpy.ops.object.modifier_apply(modifier=modifier_name)
+
+def delete_loose(bm):
+    """bmesh equivalent of edit-mode mesh.delete_loose (loose edges and verts)"""
+    loose_edges = [e for e in bm.edges if not e.link_faces]
+    if loose_edges:
+        bmesh.ops.delete(bm, geom=loose_edges, context='EDGES')
+    loose_verts = [v for v in bm.verts if not v.link_edges]
+    if loose_verts:
+        bmesh.ops.delete(bm, geom=loose_verts, context='VERTS')
+
+def make_box(name, center, dims):
+    """Box object linked to the active collection; no operator, no transform_apply"""
+    obj = bpy.data.objects.new(name, make_box_mesh(name, [(center, dims)]))
+    bpy.context.collection.objects.link(obj)
+    return obj
 
 # ============================================================================
 # STEP 0: SCENE INITIALIZATION
@@ -249,8 +346,10 @@ def apply_metric_normalization(objects, bounds, scale, report):
     
     # Apply uniform scale
     scale_parent.scale = (scale, scale, scale)
-    bpy.context.view_layer.objects.active = scale_parent
-    bpy.ops.object.transform_apply(scale=True)
+    with bpy.context.temp_override(object=scale_parent, active_object=scale_parent,
+                                   selected_objects=[scale_parent],
+                                   selected_editable_objects=[scale_parent]):
+        bpy.ops.object.transform_apply(scale=True)
     
     # Unparent and remove scaler
     bpy.ops.object.select_all(action='DESELECT')
@@ -260,13 +359,16 @@ def apply_metric_normalization(objects, bounds, scale, report):
     
     bpy.data.objects.remove(scale_parent, do_unlink=True)
     
-    # Shift geometry to Z=0
+    # Shift geometry to Z=0 (measured on refreshed matrix_world)
+    bpy.context.view_layer.update()
     new_bounds = analyze_geometry_bounds(objects)
     if new_bounds:
         z_offset = -new_bounds['min'].z
         log(f"  Shifting geometry up {z_offset:.4f}m to place floor at Z=0", "INFO")
         for obj in objects:
             obj.location.z += z_offset
+        # One refresh for the shifted objects before the walls are measured
+        bpy.context.view_layer.update()
     
     log(f"  ✓ METRIC NORMALIZATION COMPLETE: 1 Blender unit = 1 meter", "VALID")
     report.add_stage('metric_normalization_applied', True, f"Scale {scale:.6f}, floor at Z=0")
@@ -276,57 +378,107 @@ def apply_metric_normalization(objects, bounds, scale, report):
 # ============================================================================
 
 def extract_walls(objects):
-    """Extract wall mesh geometry"""
+    """
+    Extract wall mesh geometry.
+    
+    Walls are kept as parallel arrays: 'obj' (list of objects) and the
+    (N, 3) world-space 'center', 'size', 'bmin' and 'bmax' of each wall.
+    """
     log("Extracting wall geometry for volumetric processing", "STEP")
-    walls = []
     
-    for obj in objects:
-        if obj.type == 'MESH':
-            bbox_corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            min_pt = Vector((min(p.x for p in bbox_corners),
-                           min(p.y for p in bbox_corners),
-                           min(p.z for p in bbox_corners)))
-            max_pt = Vector((max(p.x for p in bbox_corners),
-                           max(p.y for p in bbox_corners),
-                           max(p.z for p in bbox_corners)))
-            
-            size = max_pt - min_pt
-            center = (min_pt + max_pt) / 2
-            
-            walls.append({
-                'obj': obj,
-                'center': center,
-                'bounds': {'min': min_pt, 'max': max_pt},
-                'size': size
-            })
-    
-    log(f"  Found {len(walls)} wall objects ready for volumetric processing", "INFO")
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    # All bound-box corners in one go: (N, 4, 4) matrices x (N, 8, 3) corners
+    mats = np.array([obj.matrix_world for obj in meshes], dtype=np.float64).reshape(-1, 4, 4)
+    corners = np.array([obj.bound_box for obj in meshes], dtype=np.float64).reshape(-1, 8, 3)
+    world = np.einsum('nij,nkj->nki', mats[:, :3, :3], corners) + mats[:, None, :3, 3]
+    bmin = world.min(axis=1)
+    bmax = world.max(axis=1)
+    
+    walls = {
+        'obj': meshes,
+        'center': (bmin + bmax) / 2,
+        'size': bmax - bmin,
+        'bmin': bmin,
+        'bmax': bmax
+    }
+    
+    log(f"  Found {len(meshes)} wall objects ready for volumetric processing", "INFO")
     return walls
 
+def wall_subset(walls, idx):
+    """The walls at positions `idx`, in the same array layout"""
+    subset = {key: arr[idx] for key, arr in walls.items() if key != 'obj'}
+    subset['obj'] = [walls['obj'][i] for i in idx]
+    return subset
+
+def wall_footprints(walls):
+    """(N, 4) array of each wall's XY extent: min x, min y, max x, max y"""
+    return np.hstack((walls['bmin'][:, :2], walls['bmax'][:, :2]))
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _footprint_summary_jit(footprints):
+        """Single pass over the footprint rows"""
+        min_x = min_y = np.inf
+        max_x = max_y = max_size = -np.inf
+        sum_x = sum_y = 0.0
+        for i in range(footprints.shape[0]):
+            x0, y0, x1, y1 = footprints[i, 0], footprints[i, 1], footprints[i, 2], footprints[i, 3]
+            min_x = min(min_x, x0)
+            min_y = min(min_y, y0)
+            max_x = max(max_x, x1)
+            max_y = max(max_y, y1)
+            max_size = max(max_size, x1 - x0)
+            sum_x += (x0 + x1) / 2
+            sum_y += (y0 + y1) / 2
+        n = footprints.shape[0]
+        return min_x, min_y, max_x, max_y, sum_x / n, sum_y / n, max_size
+
+def footprint_summary(footprints):
+    """
+    (min_x, min_y, max_x, max_y, center_x, center_y, max_size) of a non-empty
+    footprint array: overall extent, mean wall center and widest wall (X)
+    """
+    if njit is not None:
+        return tuple(float(v) for v in _footprint_summary_jit(footprints))
+    min_x, min_y = footprints[:, :2].min(axis=0).tolist()
+    max_x, max_y = footprints[:, 2:].max(axis=0).tolist()
+    center_x, center_y = ((footprints[:, :2] + footprints[:, 2:]) / 2).mean(axis=0).tolist()
+    max_size = float((footprints[:, 2] - footprints[:, 0]).max())
+    return min_x, min_y, max_x, max_y, center_x, center_y, max_size
+
 def add_wall_thickness(walls, report):
-    """Add TRUE architectural wall thickness using Solidify modifier"""
+    """
+    Add TRUE architectural wall thickness, solidifying each wall in
+    object mode with bmesh (no edit-mode switch or Solidify modifier apply)
+    """
     log(f"Adding true volumetric wall thickness ({WALL_THICKNESS_M}m)", "STEP")
     
     walls_processed = 0
+    half_thickness = WALL_THICKNESS_M / 2
     
-    for i, wall_info in enumerate(walls):
-        obj = wall_info['obj']
+    for i, obj in enumerate(walls['obj']):
+        mesh = obj.data
+        if mesh.users > 1:
+            mesh = obj.data = mesh.copy()
+        
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
         
         # Clean geometry first
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.delete_loose()
-        bpy.ops.object.mode_set(mode='OBJECT')
+        delete_loose(bm)
         
-        # Add Solidify modifier for thickness
-        solidify = obj.modifiers.new(name='Solidify', type='SOLIDIFY')
-        solidify.thickness = WALL_THICKNESS_M
-        solidify.offset = 0.0  # Center thickness on original surface
+        # bmesh solidify pushes the new shell inward by the full thickness;
+        # move the surface out by half first to center the thickness on the
+        # original surface (Solidify modifier offset=0)
+        bm.normal_update()
+        for v in bm.verts:
+            v.co += v.normal * half_thickness
+        bmesh.ops.solidify(bm, geom=list(bm.faces), thickness=WALL_THICKNESS_M)
         
-        # Apply modifier to make geometry permanent
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.modifier_apply(modifier='Solidify')
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
         
         walls_processed += 1
         log(f"  Wall {i}: {WALL_THICKNESS_M}m thickness applied (now volumetric)", "INFO")
@@ -338,12 +490,9 @@ def extrude_walls_to_cutaway_height(walls, report):
     """Extrude walls to cutaway visualization height (1.3-1.5m)"""
     log(f"Extruding walls to cutaway height {WALL_HEIGHT_CUTAWAY_M}m (open-top)", "STEP")
     
-    for i, wall_info in enumerate(walls):
-        obj = wall_info['obj']
-        size = wall_info['size']
-        
+    for i, (obj, size_z) in enumerate(zip(walls['obj'], walls['size'][:, 2].tolist())):
         # Calculate extrusion
-        current_z = max(size.z, 0.1)
+        current_z = max(size_z, 0.1)
         z_scale = WALL_HEIGHT_CUTAWAY_M / current_z
         target_z = WALL_HEIGHT_CUTAWAY_M / 2
         
@@ -351,9 +500,8 @@ def extrude_walls_to_cutaway_height(walls, report):
         obj.scale.z = z_scale
         obj.location.z = target_z
         
-        # Apply transforms to make permanent
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        # Bake straight into the mesh to make permanent
+        bake_transform(obj)
         
         log(f"  Wall {i}: extruded to {WALL_HEIGHT_CUTAWAY_M}m (open-top visualization)", "INFO")
     
@@ -364,24 +512,16 @@ def extrude_walls_to_cutaway_height(walls, report):
 # STEP 3: FLOOR SLAB CREATION
 # ============================================================================
 
-def create_floor_slab(walls, report):
-    """Create single floor slab at Z=0"""
+def create_floor_slab(footprints, report):
+    """Create single floor slab at Z=0 (`footprints` from wall_footprints)"""
     log("Creating floor slab (single ground plane)", "STEP")
     
-    if not walls:
+    if not len(footprints):
         report.add_stage('floor_exists_at_z0', False, "No walls to define floor bounds")
         return None
     
     # Calculate footprint from all walls
-    all_x = []
-    all_y = []
-    for wall_info in walls:
-        bounds = wall_info['bounds']
-        all_x.extend([bounds['min'].x, bounds['max'].x])
-        all_y.extend([bounds['min'].y, bounds['max'].y])
-    
-    min_x, max_x = min(all_x), max(all_x)
-    min_y, max_y = min(all_y), max(all_y)
+    min_x, min_y, max_x, max_y = footprint_summary(footprints)[:4]
     
     floor_center_x = (min_x + max_x) / 2
     floor_center_y = (min_y + max_y) / 2
@@ -389,18 +529,14 @@ def create_floor_slab(walls, report):
     floor_depth = max_y - min_y
     
     # Create floor slab at Z=0 (top surface)
-    floor_z = -FLOOR_THICKNESS_M / 2
+    floor_z = -_FLOOR_HALF_T
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(floor_center_x, floor_center_y, floor_z)
+    floor_obj = make_box(
+        "FloorSlab",
+        (floor_center_x, floor_center_y, floor_z),
+        (floor_width/2, floor_depth/2, _FLOOR_HALF_T)
     )
-    floor_obj = bpy.context.active_object
-    floor_obj.name = "FloorSlab"
-    floor_obj.scale = (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
-    
-    bpy.context.view_layer.objects.active = floor_obj
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+    floor_obj.data.uv_layers.new(name="UVMap")
     
     log(f"  Floor slab created: {floor_width:.3f}m × {floor_depth:.3f}m × {FLOOR_THICKNESS_M}m", "INFO")
     log(f"  Floor top surface positioned at Z=0", "INFO")
@@ -413,163 +549,264 @@ def create_floor_slab(walls, report):
 # STEP 4: ARCHITECTURAL OPENINGS (CLEAN RECTANGULAR CUTS)
 # ============================================================================
 
-def create_door_openings(walls):
-    """Create rectangular door openings via boolean subtraction"""
+def _boxes_overlap(a, b):
+    """True if two (location, dimensions) boxes intersect"""
+    (ca, da), (cb, db) = a, b
+    return all(abs(ca[k] - cb[k]) < (da[k] + db[k]) / 2 for k in range(3))
+
+def opening_masks(footprints):
+    """Boolean (has_door, has_windows) arrays for walls with the given footprints"""
+    extents = footprints[:, 2:] - footprints[:, :2]
+    has_door = (extents[:, 0] > DOOR_WIDTH_M) & (extents[:, 1] > DOOR_WIDTH_M)
+    has_windows = extents[:, 0] > _MIN_WINDOW_WALL_X
+    return has_door, has_windows
+
+def apply_openings(walls, footprints):
+    """
+    Create rectangular door and window openings via boolean subtraction
+    (`footprints` from wall_footprints).
+    
+    All door/window boxes of a wall are built into one cutter mesh, so the
+    wall is cut with one boolean instead of one per opening. Overlapping
+    boxes go into a separate cutter, since the solvers need a cutter
+    without self-intersections.
+    
+    Cutters are closed axis-aligned boxes, so the FAST solver is used; a
+    cut it fails on is retried with EXACT.
+    """
     log(f"Creating architectural door openings ({DOOR_WIDTH_M}m × {DOOR_HEIGHT_CUTAWAY_M}m)", "STEP")
+    log(f"Creating architectural window openings ({WINDOW_WIDTH_M}m × {WINDOW_HEIGHT_M}m @ {WINDOW_SILL_HEIGHT_M}m sill)", "STEP")
+    
+    # Decide which walls get a door and/or windows up front; the rest are
+    # never visited
+    has_door, has_windows = opening_masks(footprints)
+    eligible = np.flatnonzero(has_door | has_windows).tolist()
     
-    doors_created = 0
+    booleans = 0
+    # One cutter object whose mesh is refilled for every batch
+    cutter = None
     
-    for i, wall_info in enumerate(walls):
-        wall_obj = wall_info['obj']
-        center = wall_info['center']
-        size = wall_info['size']
+    for i in eligible:
+        wall_obj = walls['obj'][i]
+        center_x, center_y, _ = walls['center'][i].tolist()
+        size_x, size_y, _ = walls['size'][i].tolist()
         
-        if size.x > DOOR_WIDTH_M and size.y > DOOR_WIDTH_M:
-            door_z = DOOR_HEIGHT_CUTAWAY_M / 2
-            
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=(center.x, center.y, door_z)
-            )
-            door_cutter = bpy.context.active_object
-            door_cutter.name = f"DoorCutter_{i}"
-            door_cutter.scale = (DOOR_WIDTH_M/2 + 0.02, size.y/2 + 0.1, DOOR_HEIGHT_CUTAWAY_M/2)
-            
-            bpy.context.view_layer.objects.active = door_cutter
-            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        # (location, dimensions) of each opening box
+        boxes = []
+        if has_door[i]:
+            boxes.append((
+                (center_x, center_y, _DOOR_Z),
+                (_DOOR_CUTTER_W, size_y/2 + 0.1, _DOOR_CUTTER_H)
+            ))
+        
+        if has_windows[i]:
+            for x_offset in (-size_x/4, size_x/4):
+                boxes.append((
+                    (center_x + x_offset, center_y, _WINDOW_Z),
+                    (_WINDOW_CUTTER_W, size_y/2 + 0.1, _WINDOW_CUTTER_H)
+                ))
+        
+        batches = []
+        for box in boxes:
+            for batch in batches:
+                if not any(_boxes_overlap(box, other) for other in batch):
+                    batch.append(box)
+                    break
+            else:
+                batches.append([box])
+        
+        for b_idx, batch in enumerate(batches):
+            if cutter is None:
+                cutter = bpy.data.objects.new("OpeningCutter", make_box_mesh("OpeningCutter", batch))
+                bpy.context.scene.collection.objects.link(cutter)
+            else:
+                fill_box_mesh(cutter.data, batch)
             
             # Boolean difference
-            bool_mod = wall_obj.modifiers.new(name=f'DoorBool_{i}', type='BOOLEAN')
+            bool_mod = wall_obj.modifiers.new(name=f'OpeningBool_{i}_{b_idx}', type='BOOLEAN')
             bool_mod.operation = 'DIFFERENCE'
-            bool_mod.object = door_cutter
-            bool_mod.solver = 'MANIFOLD'
+            bool_mod.object = cutter
+            bool_mod.solver = 'FAST'
             
-            bpy.context.view_layer.objects.active = wall_obj
-            bpy.ops.object.modifier_apply(modifier=f'DoorBool_{i}')
+            try:
+                apply_modifier(wall_obj, bool_mod.name)
+            except RuntimeError as e:
+                log(f"  Wall {i}: FAST boolean failed ({e}), retrying with EXACT", "WARN")
+                bool_mod.solver = 'EXACT'
+                apply_modifier(wall_obj, bool_mod.name)
             
-            bpy.data.objects.remove(door_cutter, do_unlink=True)
-            doors_created += 1
-    
-    log(f"  ✓ {doors_created} door openings created", "VALID")
-
-def create_window_openings(walls):
-    """Create rectangular window openings via boolean subtraction"""
-    log(f"Creating architectural window openings ({WINDOW_WIDTH_M}m × {WINDOW_HEIGHT_M}m @ {WINDOW_SILL_HEIGHT_M}m sill)", "STEP")
-    
-    windows_created = 0
-    
-    for i, wall_info in enumerate(walls):
-        wall_obj = wall_info['obj']
-        center = wall_info['center']
-        size = wall_info['size']
+            booleans += 1
+    
+    if cutter is not None:
+        cutter_mesh = cutter.data
+        bpy.data.objects.remove(cutter, do_unlink=True)
+        bpy.data.meshes.remove(cutter_mesh)
+    
+    log(f"  ✓ {int(has_door.sum())} door openings created", "VALID")
+    log(f"  ✓ {2 * int(has_windows.sum())} window openings created", "VALID")
+    log(f"  {booleans} boolean(s) applied", "INFO")
+
+def apply_openings_parallel(walls, footprints, workers):
+    """
+    Cut openings in `workers` background Blender processes.
+    
+    Walls that get openings are dealt round-robin into partitions. Each
+    partition is written to a .blend library with the walls' extents in a
+    JSON sidecar; a worker (this script with --cut-openings) runs
+    apply_openings on it and writes the cut meshes back, which are then
+    swapped into the walls here. A partition whose worker fails is cut in
+    this process instead.
+    """
+    has_door, has_windows = opening_masks(footprints)
+    eligible = np.flatnonzero(has_door | has_windows).tolist()
+    parts = [p for p in (eligible[k::workers] for k in range(workers)) if p]
+    log(f"Cutting openings of {len(eligible)} walls in {len(parts)} worker process(es)", "STEP")
+    
+    # Workers each get one core; keep NumPy from spawning a thread pool per process
+    env = dict(os.environ, OPENBLAS_NUM_THREADS='1', OMP_NUM_THREADS='1')
+    
+    with tempfile.TemporaryDirectory(prefix="cutaway_") as tmp:
+        jobs = []
+        for k, part in enumerate(parts):
+            src = os.path.join(tmp, f"part_{k}.blend")
+            meta = os.path.join(tmp, f"part_{k}.json")
+            dst = os.path.join(tmp, f"cut_{k}.blend")
+            bpy.data.libraries.write(src, {walls['obj'][i] for i in part}, fake_user=True)
+            with open(meta, 'w') as f:
+                json.dump({
+                    'names': [walls['obj'][i].name for i in part],
+                    'bmin': walls['bmin'][part].tolist(),
+                    'bmax': walls['bmax'][part].tolist()
+                }, f)
+            cmd = [bpy.app.binary_path, '--background', '--factory-startup',
+                   '--python', os.path.abspath(__file__), '--', '--cut-openings', src, meta, dst]
+            jobs.append((part, dst, cmd))
         
-        if size.x > WINDOW_WIDTH_M * 2:
-            for w_idx in range(2):
-                x_offset = -size.x/4 if w_idx == 0 else size.x/4
-                window_z = WINDOW_SILL_HEIGHT_M + WINDOW_HEIGHT_M / 2
-                
-                bpy.ops.mesh.primitive_cube_add(
-                    size=1,
-                    location=(center.x + x_offset, center.y, window_z)
-                )
-                window_cutter = bpy.context.active_object
-                window_cutter.name = f"WindowCutter_{i}_{w_idx}"
-                window_cutter.scale = (WINDOW_WIDTH_M/2 + 0.02, size.y/2 + 0.1, WINDOW_HEIGHT_M/2)
-                
-                bpy.context.view_layer.objects.active = window_cutter
-                bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-                
-                bool_mod = wall_obj.modifiers.new(name=f'WindowBool_{i}_{w_idx}', type='BOOLEAN')
-                bool_mod.operation = 'DIFFERENCE'
-                bool_mod.object = window_cutter
-                bool_mod.solver = 'MANIFOLD'
-                
-                bpy.context.view_layer.objects.active = wall_obj
-                bpy.ops.object.modifier_apply(modifier=f'WindowBool_{i}_{w_idx}')
-                
-                bpy.data.objects.remove(window_cutter, do_unlink=True)
-                windows_created += 1
-    
-    log(f"  ✓ {windows_created} window openings created", "VALID")
-
-# ============================================================================
-# STEP 5: GEOMETRY VALIDATION & CLEANUP
-# ============================================================================
-
-def fix_normals_and_shading(objects, report):
-    """Recalculate normals and apply smooth shading"""
-    log("Fixing normals and applying architectural shading", "STEP")
-    
-    for obj in objects:
-        if obj.type != 'MESH':
-            continue
+        def run(job):
+            return subprocess.run(job[2], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
         
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.shade_smooth()
+        with ThreadPoolExecutor(max_workers=len(jobs) or 1) as pool:
+            results = list(pool.map(run, jobs))
         
-        # Recalculate normals
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        for (part, dst, _), result in zip(jobs, results):
+            if result.returncode != 0 or not os.path.exists(dst):
+                log(f"  Worker for {len(part)} walls failed (exit {result.returncode}), cutting locally", "WARN")
+                apply_openings(wall_subset(walls, part), footprints[part])
+                continue
+            with bpy.data.libraries.load(dst) as (data_from, data_to):
+                data_to.meshes = [f"cut_{n}" for n in range(len(part))]
+            for i, new_mesh in zip(part, data_to.meshes):
+                wall_obj = walls['obj'][i]
+                old_mesh = wall_obj.data
+                name = old_mesh.name
+                wall_obj.data = new_mesh
+                new_mesh.use_fake_user = False
+                if old_mesh.users == 0:
+                    bpy.data.meshes.remove(old_mesh)
+                new_mesh.name = name
+    
+    log(f"  ✓ {int(has_door.sum())} door openings created", "VALID")
+    log(f"  ✓ {2 * int(has_windows.sum())} window openings created", "VALID")
+
+def run_openings_worker(src, meta_path, dst):
+    """--cut-openings entry point: cut one partition written by apply_openings_parallel"""
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    
+    with open(meta_path) as f:
+        meta = json.load(f)
+    with bpy.data.libraries.load(src) as (data_from, data_to):
+        data_to.objects = list(meta['names'])
+    for obj in data_to.objects:
+        bpy.context.scene.collection.objects.link(obj)
+    
+    bmin = np.array(meta['bmin'], dtype=np.float64).reshape(-1, 3)
+    bmax = np.array(meta['bmax'], dtype=np.float64).reshape(-1, 3)
+    walls = {
+        'obj': list(data_to.objects),
+        'center': (bmin + bmax) / 2,
+        'size': bmax - bmin,
+        'bmin': bmin,
+        'bmax': bmax
+    }
+    apply_openings(walls, wall_footprints(walls))
     
-    log(f"  ✓ Normals recalculated and validated for {len(objects)} objects", "VALID")
-    report.add_stage('normals_valid', True, f"{len(objects)} objects processed")
+    # Fixed names so the parent can load them back in order
+    for n, obj in enumerate(walls['obj']):
+        obj.data.name = f"cut_{n}"
+    bpy.data.libraries.write(dst, {obj.data for obj in walls['obj']}, fake_user=True)
 
 # ============================================================================
-# STEP 6: ARCHITECTURAL VISUALIZATION MATERIALS
+# STEP 5 + 6: GEOMETRY CLEANUP & ARCHITECTURAL VISUALIZATION MATERIALS
 # ============================================================================
 
 def create_material(name, color_rgb, roughness=0.75):
-    """Create architectural-grade material"""
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
+    """Create (or reuse by name) an architectural-grade material"""
+    mat = bpy.data.materials.get(name) or bpy.data.materials.new(name=name)
+    if not mat.use_nodes:
+        mat.use_nodes = True
     bsdf = mat.node_tree.nodes.get("Principled BSDF")
     if bsdf:
-        bsdf.inputs['Base Color'].default_value = (*color_rgb, 1.0)
-        bsdf.inputs['Roughness'].default_value = roughness
-        bsdf.inputs['Metallic'].default_value = 0.0
+        # Look the sockets up once, then set them
+        base_color, rough, metallic = (bsdf.inputs[k] for k in ('Base Color', 'Roughness', 'Metallic'))
+        base_color.default_value = (*color_rgb, 1.0)
+        rough.default_value = roughness
+        metallic.default_value = 0.0
     return mat
 
-def assign_materials(walls, floor, report):
-    """Assign high-contrast materials"""
-    log("Assigning architectural materials (high-contrast)", "STEP")
-    
+def finalize_mesh(obj, mat):
+    """
+    Recalculate normals, smooth-shade and give the mesh exactly one material
+    slot holding `mat`, opening the mesh once
+    """
+    mesh = obj.data
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+    bm.to_mesh(mesh)
+    bm.free()
+    
+    mesh.materials.clear()
+    mesh.materials.append(mat)
+    
+    # shade_smooth() and material_index in one write each
+    n = len(mesh.polygons)
+    mesh.polygons.foreach_set("use_smooth", np.ones(n, dtype=bool))
+    mesh.polygons.foreach_set("material_index", np.zeros(n, dtype=np.int32))
+    mesh.update()
+
+def finalize_meshes(walls, floor, report):
+    """Fix normals and shading and assign high-contrast materials in one pass per mesh"""
+    log("Fixing normals, architectural shading and materials (high-contrast)", "STEP")
+    
+    # One shared datablock per material
     mat_walls = create_material("Walls", COLOR_WALLS_RGB, MATERIAL_ROUGHNESS)
     mat_floor = create_material("FloorMaterial", COLOR_FLOOR_RGB, MATERIAL_ROUGHNESS)
     
-    for wall_info in walls:
-        obj = wall_info['obj']
-        if obj.data.materials:
-            obj.data.materials[0] = mat_walls
-        else:
-            obj.data.materials.append(mat_walls)
-    
+    objects = [(obj, mat_walls) for obj in walls['obj']]
     if floor:
-        if floor.data.materials:
-            floor.data.materials[0] = mat_floor
-        else:
-            floor.data.materials.append(mat_floor)
+        objects.append((floor, mat_floor))
+    for obj, mat in objects:
+        finalize_mesh(obj, mat)
+    
+    log(f"  ✓ Normals recalculated and validated for {len(objects)} objects", "VALID")
+    report.add_stage('normals_valid', True, f"{len(objects)} objects processed")
     
     log(f"  Wall material: Warm beige RGB{COLOR_WALLS_RGB}", "INFO")
     log(f"  Floor material: Neutral gray RGB{COLOR_FLOOR_RGB}", "INFO")
     log(f"  Finish: Matte (roughness {MATERIAL_ROUGHNESS})", "INFO")
     log(f"  ✓ HIGH-CONTRAST MATERIALS ASSIGNED", "VALID")
-    
     report.add_stage('materials_assigned', True, "Walls + Floor")
 
 # ============================================================================
 # STEP 7: CAMERA & LIGHTING (PRESENTATION-READY)
 # ============================================================================
 
-def add_camera_and_lighting(walls, report):
-    """Add isometric camera and soft lighting"""
+def add_camera_and_lighting(footprints, report):
+    """Add isometric camera and soft lighting (`footprints` from wall_footprints)"""
     log("Adding presentation-ready camera and lighting", "STEP")
     
-    if walls:
-        center_x = sum(w['center'].x for w in walls) / len(walls)
-        center_y = sum(w['center'].y for w in walls) / len(walls)
-        max_size = max(w['size'].x for w in walls)
+    if len(footprints):
+        center_x, center_y, max_size = footprint_summary(footprints)[4:]
     else:
         center_x, center_y, max_size = 0, 0, 10
     
@@ -587,11 +824,23 @@ def add_camera_and_lighting(walls, report):
     camera = bpy.context.active_object
     camera.name = "CutawayCamera"
     
-    # Point at scene center
+    # Point at scene center: build the look-at basis directly (camera looks
+    # down its -Z with +Y up), same orientation as to_track_quat('-Z', 'Y')
+    cam_loc = camera.location.copy()
     look_target = Vector((center_x, center_y, WALL_HEIGHT_CUTAWAY_M * 0.5))
-    direction = look_target - Vector(camera.location)
-    rot_quat = direction.to_track_quat('-Z', 'Y')
-    camera.rotation_euler = rot_quat.to_euler()
+    forward = (look_target - cam_loc).normalized()
+    right = forward.cross(Vector((0.0, 0.0, 1.0)))
+    if right.length < 1e-6:
+        # Looking straight down; any horizontal right axis will do
+        right = Vector((1.0, 0.0, 0.0))
+    right.normalize()
+    up = right.cross(forward)
+    camera.matrix_world = Matrix((
+        (right.x, up.x, -forward.x, cam_loc.x),
+        (right.y, up.y, -forward.y, cam_loc.y),
+        (right.z, up.z, -forward.z, cam_loc.z),
+        (0.0, 0.0, 0.0, 1.0)
+    ))
     
     bpy.context.scene.camera = camera
     log(f"  ✓ Isometric cutaway camera positioned for full interior visibility", "VALID")
@@ -604,7 +853,7 @@ def add_camera_and_lighting(walls, report):
     sun = bpy.context.active_object
     sun.name = "CutawayLight"
     sun.data.energy = 1.2
-    sun.data.angle = math.radians(8)
+    sun.data.angle = _SUN_ANGLE_RAD
     
     log(f"  ✓ Sun light added for soft architectural shadows", "VALID")
     
@@ -618,23 +867,43 @@ def export_final_glb(filepath, report):
     """Export as GLB - ready to use without post-processing"""
     log("Exporting final GLB model (zero-adjustment requirement)", "STEP")
     
-    bpy.ops.object.select_all(action='SELECT')
-    
     try:
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            export_format='GLB'
-        )
+        # Whole scene, no selection pass. Static scene: skip animation
+        # sampling, skins, morphs and images; the presentation camera and
+        # sun are part of the deliverable
+        try:
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                export_format='GLB',
+                use_selection=False,
+                export_apply=True,
+                export_animations=False,
+                export_skins=False,
+                export_morph=False,
+                export_lights=True,
+                export_cameras=True,
+                export_materials='EXPORT',
+                export_image_format='NONE',
+                export_draco_mesh_compression_enable=False
+            )
+        except TypeError:
+            # Option names differ between exporter versions
+            bpy.ops.export_scene.gltf(
+                filepath=filepath,
+                export_format='GLB'
+            )
         
-        if os.path.exists(filepath):
+        # One stat call: a missing file raises instead of a separate exists()
+        try:
             file_size_kb = os.path.getsize(filepath) / 1024
-            log(f"  ✓ Export successful: {file_size_kb:.2f} KB", "VALID")
-            report.add_stage('export_successful', True, f"{file_size_kb:.2f} KB file")
-            return True
-        else:
+        except OSError:
             log(f"  ✗ Export failed: file not created", "ERR")
             report.add_stage('export_successful', False, "File not created")
             return False
+        
+        log(f"  ✓ Export successful: {file_size_kb:.2f} KB", "VALID")
+        report.add_stage('export_successful', True, f"{file_size_kb:.2f} KB file")
+        return True
     
     except Exception as e:
         log(f"  ✗ Export error: {e}", "ERR")
@@ -652,8 +921,18 @@ def main():
     if '--' in argv:
         argv = argv[argv.index('--') + 1:]
     
+    if argv[:1] == ['--cut-openings'] and len(argv) >= 4:
+        run_openings_worker(*argv[1:4])
+        return
+    
+    workers = 1
+    if '--workers' in argv:
+        idx = argv.index('--workers')
+        workers = max(1, int(argv[idx + 1]))
+        argv = argv[:idx] + argv[idx + 2:]
+    
     if len(argv) < 2:
-        log("USAGE: blender --background --python convert_to_cutaway_prod.py -- input.glb output.glb", "ERR")
+        log("USAGE: blender --background --python convert_to_cutaway_prod.py -- input.glb output.glb [--workers N]", "ERR")
         return
     
     input_glb = argv[0]
@@ -661,6 +940,9 @@ def main():
     
     report = ValidationReport()
     
+    # Keep the UI from redrawing while the pipeline runs
+    bpy.context.scene.render.use_lock_interface = True
+    
     log("="*80, "STEP")
     log("PROFESSIONAL ARCHITECTURAL CUTAWAY CONVERTER", "STEP")
     log("Production-Grade Pipeline with Full Validation", "STEP")
@@ -683,26 +965,26 @@ def main():
         extrude_walls_to_cutaway_height(walls, report)
         
         # STEP 3: FLOOR SLAB CREATION
-        floor = create_floor_slab(walls, report)
+        footprints = wall_footprints(walls)
+        floor = create_floor_slab(footprints, report)
         
         # STEP 4: ARCHITECTURAL OPENINGS
-        create_door_openings(walls)
-        create_window_openings(walls)
-        
-        # STEP 5: GEOMETRY VALIDATION & CLEANUP
-        all_objs = [w['obj'] for w in walls] + ([floor] if floor else [])
-        fix_normals_and_shading(all_objs, report)
+        if workers > 1:
+            apply_openings_parallel(walls, footprints, workers)
+        else:
+            apply_openings(walls, footprints)
         
-        # STEP 6: ARCHITECTURAL MATERIALS
-        assign_materials(walls, floor, report)
+        # STEP 5 + 6: GEOMETRY CLEANUP & ARCHITECTURAL MATERIALS
+        finalize_meshes(walls, floor, report)
         
         # STEP 7: CAMERA & LIGHTING
-        add_camera_and_lighting(walls, report)
+        add_camera_and_lighting(footprints, report)
         
         # STEP 8: EXPORT
         export_final_glb(output_glb, report)
         
         # Print validation report
+        flush_log()
         success = report.report()
         
         if success:
@@ -718,4 +1000,7 @@ def main():
         traceback.print_exc()
 
 if __name__ == '__main__':
-    main()
+    try:
+        main()
+    finally:
+        flush_log()
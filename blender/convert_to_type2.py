@@ -10,28 +10,49 @@ architectural model (Type-2) with:
 - Camera for visualization
 
 Usage:
-blender --background --python convert_to_type2.py -- input_type1.glb output_type2.glb [--walls-file walls.json]
+blender --background --python convert_to_type2.py -- input_type1.glb output_type2.glb [--walls-file walls.json] [--workers N]
+
+With --workers N > 1, wall thickness and openings are computed in N background
+Blender processes (this script with --chunk i/N), each handling every N-th wall.
 """
 
 import bpy
+import bmesh
 import json
 import sys
 import os
+import shutil
+import subprocess
+import tempfile
+import time
 from mathutils import Vector, Matrix
 import math
+import numpy as np
+
+# Unit cube centred on the origin, faces wound outward
+_CUBE_VERTS = np.array([
+    (-0.5, -0.5, -0.5), (0.5, -0.5, -0.5), (0.5, 0.5, -0.5), (-0.5, 0.5, -0.5),
+    (-0.5, -0.5, 0.5), (0.5, -0.5, 0.5), (0.5, 0.5, 0.5), (-0.5, 0.5, 0.5),
+])
+_CUBE_FACES = np.array([
+    (0, 3, 2, 1), (4, 5, 6, 7), (0, 1, 5, 4),
+    (1, 2, 6, 5), (2, 3, 7, 6), (3, 0, 4, 7),
+])
+
+# Per-wall progress lines are only printed when TYPE2_VERBOSE is set; each
+# phase always prints one summary line
+_VERBOSE = bool(os.environ.get("TYPE2_VERBOSE"))
 
-def log(msg):
+def log(msg, verbose=False):
     """Print with timestamp for debugging"""
+    if verbose and not _VERBOSE:
+        return
     print(f"[Type2Conv] {msg}")
 
 def clear_scene():
     """Remove all default objects"""
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
-    for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
+    # One call for objects, meshes and materials; no selection operators
+    bpy.data.batch_remove(ids=tuple(bpy.data.objects) + tuple(bpy.data.meshes) + tuple(bpy.data.materials))
 
 def import_glb(filepath):
     """Import GLB file"""
@@ -45,24 +66,56 @@ def import_glb(filepath):
     log(f"Imported {len(imported)} objects")
     return imported
 
+# Corners of the unit cube, stretched onto each object's local bound box
+_UNIT_CORNERS = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], np.float32)
+
+def world_bounds(objects):
+    """World-space axis-aligned bounds of each object's bound_box
+    
+    Only the two extreme bound_box corners are read per object; all 8N
+    corners are rebuilt from _UNIT_CORNERS and transformed in one NumPy pass.
+    Returns: (mins, maxs) float32 arrays of shape (N, 3)
+    """
+    n = len(objects)
+    M = np.empty((n, 4, 4), np.float32)
+    lo = np.empty((n, 3), np.float32)
+    hi = np.empty((n, 3), np.float32)
+    for i, obj in enumerate(objects):
+        bbox = obj.bound_box
+        M[i] = obj.matrix_world
+        lo[i] = bbox[0]
+        hi[i] = bbox[6]
+    local = lo[:, None, :] + _UNIT_CORNERS * (hi - lo)[:, None, :]
+    world = np.einsum('nij,nkj->nki', M[:, :3, :3], local) + M[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+def mesh_world_bounds(obj):
+    """Exact world-space (min, max) of a mesh object from its vertex buffer
+    
+    Unlike bound_box, this is current right after the mesh data is replaced.
+    """
+    co = np.empty(len(obj.data.vertices) * 3, np.float32)
+    obj.data.vertices.foreach_get('co', co)
+    M = np.array(obj.matrix_world, np.float32)
+    world = co.reshape(-1, 3) @ M[:3, :3].T + M[:3, 3]
+    return world.min(axis=0), world.max(axis=0)
+
 def get_walls_from_objects(objects):
     """Extract wall geometry from imported objects
     
-    Returns: list of dicts with keys 'obj', 'center', 'bounds'
+    Returns: (walls, scene_bounds)
+        walls: list of dicts with keys 'obj', 'center', 'bounds'
+        scene_bounds: dict with 'min', 'max', 'center' of all walls plus
+            'mean_center' and 'max_wall_size' for camera framing (None if no walls)
     """
     walls = []
-    for obj in objects:
-        if obj.type == 'MESH':
-            # Get bounding box
-            bbox_corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-            
-            # Calculate center and size
-            min_pt = Vector((min(p.x for p in bbox_corners),
-                           min(p.y for p in bbox_corners),
-                           min(p.z for p in bbox_corners)))
-            max_pt = Vector((max(p.x for p in bbox_corners),
-                           max(p.y for p in bbox_corners),
-                           max(p.z for p in bbox_corners)))
+    scene_bounds = None
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    if meshes:
+        mins, maxs = world_bounds(meshes)
+        for obj, mn, mx in zip(meshes, mins.tolist(), maxs.tolist()):
+            min_pt = Vector(mn)
+            max_pt = Vector(mx)
             
             center = (min_pt + max_pt) / 2
             size = max_pt - min_pt
@@ -73,9 +126,23 @@ def get_walls_from_objects(objects):
                 'bounds': {'min': min_pt, 'max': max_pt},
                 'size': size
             })
+        
+        # Scene-wide aggregates, computed once and passed down the pipeline
+        all_min = mins.min(axis=0)
+        all_max = maxs.max(axis=0)
+        scene_bounds = {
+            'min': Vector(all_min.tolist()),
+            'max': Vector(all_max.tolist()),
+            'center': Vector(((all_min + all_max) / 2).tolist()),
+            'mean_center': Vector(((mins + maxs) / 2).mean(axis=0).tolist()),
+            'max_wall_size': float((maxs - mins)[:, 0].max())
+        }
     
     log(f"Found {len(walls)} wall objects")
-    return walls
+    return walls, scene_bounds
+
+# Principled BSDF node tree built once; every material is a copy of it
+_MATERIAL_TEMPLATE = None
 
 def create_material(name, color_rgb, roughness=0.6, metallic=0.0):
     """Create a basic material with PBR properties
@@ -86,8 +153,13 @@ def create_material(name, color_rgb, roughness=0.6, metallic=0.0):
         roughness: 0-1
         metallic: 0-1
     """
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
+    global _MATERIAL_TEMPLATE
+    if _MATERIAL_TEMPLATE is None:
+        _MATERIAL_TEMPLATE = bpy.data.materials.new(name="_arch_template")
+        _MATERIAL_TEMPLATE.use_nodes = True
+    
+    mat = _MATERIAL_TEMPLATE.copy()
+    mat.name = name
     
     bsdf = mat.node_tree.nodes["Principled BSDF"]
     bsdf.inputs['Base Color'].default_value = (*color_rgb, 1.0)
@@ -96,6 +168,34 @@ def create_material(name, color_rgb, roughness=0.6, metallic=0.0):
     
     return mat
 
+def apply_modifiers_batched(objects):
+    """Bake the modifier stacks of all objects with one depsgraph evaluation
+    
+    Replaces per-object modifier_apply calls, each of which re-evaluates
+    the whole scene.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for obj in objects:
+        _swap_mesh(obj, bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph)))
+
+def _swap_mesh(obj, new_mesh):
+    """Give obj its baked mesh, drop its modifiers and free the old mesh"""
+    old_mesh = obj.data
+    obj.data = new_mesh
+    obj.modifiers.clear()
+    if old_mesh.users == 0:
+        name = old_mesh.name
+        bpy.data.meshes.remove(old_mesh)
+        new_mesh.name = name
+
+def _is_manifold(mesh):
+    """True if every edge of the mesh is shared by exactly two faces"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    manifold = all(e.is_manifold for e in bm.edges)
+    bm.free()
+    return manifold
+
 def apply_wall_thickness(walls_data, wall_thickness=0.23):
     """Apply thickness to wall objects using Solidify modifier
     
@@ -104,6 +204,7 @@ def apply_wall_thickness(walls_data, wall_thickness=0.23):
         wall_thickness: Wall thickness in meters
     """
     log(f"Applying wall thickness: {wall_thickness}m")
+    start = time.perf_counter()
     
     for wall_info in walls_data:
         obj = wall_info['obj']
@@ -112,18 +213,31 @@ def apply_wall_thickness(walls_data, wall_thickness=0.23):
         solidify = obj.modifiers.new(name='Solidify', type='SOLIDIFY')
         solidify.thickness = wall_thickness
         solidify.offset = 0  # Center the thickness
-        
-        # Apply modifier
-        with bpy.context.temp_override(object=obj):
-            bpy.ops.object.modifier_apply(modifier='Solidify')
-        
-        log(f"Applied thickness to {obj.name}")
+    
+    # Apply all Solidify modifiers at once
+    apply_modifiers_batched([w['obj'] for w in walls_data])
+    
+    for wall_info in walls_data:
+        log(f"Applied thickness to {wall_info['obj'].name}", verbose=True)
+    log(f"Applied thickness to {len(walls_data)} walls in {time.perf_counter() - start:.2f}s")
+
+def fast_cube(name, location, scale):
+    """Create a size=1 cube object without going through bpy.ops"""
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(_CUBE_VERTS.tolist(), [], _CUBE_FACES.tolist())
+    mesh.update()
+    obj = bpy.data.objects.new(name, mesh)
+    obj.location = location
+    obj.scale = scale
+    bpy.context.collection.objects.link(obj)
+    return obj
 
-def create_floor_and_ceiling(walls_data, wall_height=3.0, floor_thickness=0.15, scale_m_per_px=0.01):
+def create_floor_and_ceiling(walls_data, scene_bounds, wall_height=3.0, floor_thickness=0.15, scale_m_per_px=0.01):
     """Create floor and ceiling slabs
     
     Args:
         walls_data: Wall objects list
+        scene_bounds: Overall wall bounds from get_walls_from_objects
         wall_height: Height of walls in meters
         floor_thickness: Floor slab thickness
         scale_m_per_px: Conversion factor from pixel to meters
@@ -134,19 +248,9 @@ def create_floor_and_ceiling(walls_data, wall_height=3.0, floor_thickness=0.15,
         log("WARNING: No walls to create floor/ceiling from")
         return None, None
     
-    # Get overall bounding box of all walls
-    all_min = Vector((float('inf'), float('inf'), float('inf')))
-    all_max = Vector((float('-inf'), float('-inf'), float('-inf')))
-    
-    for wall_info in walls_data:
-        bounds = wall_info['bounds']
-        all_min.x = min(all_min.x, bounds['min'].x)
-        all_min.y = min(all_min.y, bounds['min'].y)
-        all_min.z = min(all_min.z, bounds['min'].z)
-        
-        all_max.x = max(all_max.x, bounds['max'].x)
-        all_max.y = max(all_max.y, bounds['max'].y)
-        all_max.z = max(all_max.z, bounds['max'].z)
+    # Overall bounding box of all walls
+    all_min = scene_bounds['min']
+    all_max = scene_bounds['max']
     
     # Floor slab at Z=0
     floor_size = (all_max.x - all_min.x, all_max.y - all_min.y, floor_thickness)
@@ -156,13 +260,7 @@ def create_floor_and_ceiling(walls_data, wall_height=3.0, floor_thickness=0.15,
         -floor_thickness / 2
     ))
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=floor_center
-    )
-    floor_obj = bpy.context.active_object
-    floor_obj.name = "Floor"
-    floor_obj.scale = (floor_size[0]/2, floor_size[1]/2, floor_size[2]/2)
+    floor_obj = fast_cube("Floor", floor_center, (floor_size[0]/2, floor_size[1]/2, floor_size[2]/2))
     
     # Ceiling slab
     ceiling_z = all_max.z + wall_height / 2
@@ -172,22 +270,17 @@ def create_floor_and_ceiling(walls_data, wall_height=3.0, floor_thickness=0.15,
         ceiling_z
     ))
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=ceiling_center
-    )
-    ceiling_obj = bpy.context.active_object
-    ceiling_obj.name = "Ceiling"
-    ceiling_obj.scale = (floor_size[0]/2, floor_size[1]/2, floor_thickness/2)
+    ceiling_obj = fast_cube("Ceiling", ceiling_center, (floor_size[0]/2, floor_size[1]/2, floor_thickness/2))
     
     log(f"Created floor and ceiling")
     return floor_obj, ceiling_obj
 
-def create_door_openings(walls_data, door_width=0.9, door_height=2.1):
-    """Create door openings using boolean operations
+def create_door_openings(walls_data, openings, door_width=0.9, door_height=2.1):
+    """Plan door openings; cut later by create_all_openings
     
     Args:
         walls_data: Wall objects
+        openings: Dict of wall index -> list of (center, dims) cutter boxes
         door_width: Standard door width in meters
         door_height: Standard door height in meters
     """
@@ -195,7 +288,6 @@ def create_door_openings(walls_data, door_width=0.9, door_height=2.1):
     
     # For each wall, create one door opening at center bottom
     for i, wall_info in enumerate(walls_data):
-        wall_obj = wall_info['obj']
         center = wall_info['center']
         size = wall_info['size']
         
@@ -208,35 +300,16 @@ def create_door_openings(walls_data, door_width=0.9, door_height=2.1):
                 center.z - (size.z / 2) + (door_height / 2)  # Align to bottom
             ))
             
-            # Create door cutter (slightly oversized to ensure clean cut)
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=door_center
-            )
-            door_cutter = bpy.context.active_object
-            door_cutter.name = f"DoorCutter_{i}"
-            door_cutter.scale = (door_width/2 + 0.01, size.y/2 + 0.1, door_height/2)
-            
-            # Apply boolean difference
-            bool_mod = wall_obj.modifiers.new(name=f'BoolDoor_{i}', type='BOOLEAN')
-            bool_mod.operation = 'DIFFERENCE'
-            bool_mod.object = door_cutter
-            bool_mod.solver = 'FAST'
-            
-            # Apply modifier
-            with bpy.context.temp_override(object=wall_obj):
-                bpy.ops.object.modifier_apply(modifier=f'BoolDoor_{i}')
-            
-            # Remove cutter
-            bpy.data.objects.remove(door_cutter, do_unlink=True)
-            
-            log(f"Added door opening to {wall_obj.name}")
+            # Door cutter (slightly oversized to ensure clean cut)
+            dims = (door_width/2 + 0.01, size.y/2 + 0.1, door_height/2)
+            openings.setdefault(i, []).append((door_center, dims))
 
-def create_window_openings(walls_data, window_width=1.2, window_height=1.2, sill_height=0.9):
-    """Create window openings using boolean operations
+def create_window_openings(walls_data, openings, window_width=1.2, window_height=1.2, sill_height=0.9):
+    """Plan window openings; cut later by create_all_openings
     
     Args:
         walls_data: Wall objects
+        openings: Dict of wall index -> list of (center, dims) cutter boxes
         window_width: Window width in meters
         window_height: Window height in meters
         sill_height: Height from floor to window sill
@@ -244,7 +317,6 @@ def create_window_openings(walls_data, window_width=1.2, window_height=1.2, sill
     log(f"Creating window openings (W:{window_width}m x H:{window_height}m @ {sill_height}m sill)")
     
     for i, wall_info in enumerate(walls_data):
-        wall_obj = wall_info['obj']
         center = wall_info['center']
         size = wall_info['size']
         
@@ -260,27 +332,184 @@ def create_window_openings(walls_data, window_width=1.2, window_height=1.2, sill
                     center.z - (size.z / 2) + sill_height + (window_height / 2)
                 ))
                 
-                # Create window cutter
-                bpy.ops.mesh.primitive_cube_add(
-                    size=1,
-                    location=window_center
-                )
-                window_cutter = bpy.context.active_object
-                window_cutter.name = f"WindowCutter_{i}_{w_idx}"
-                window_cutter.scale = (window_width/2 + 0.01, size.y/2 + 0.1, window_height/2)
-                
-                # Apply boolean
-                bool_mod = wall_obj.modifiers.new(name=f'BoolWindow_{i}_{w_idx}', type='BOOLEAN')
-                bool_mod.operation = 'DIFFERENCE'
-                bool_mod.object = window_cutter
-                bool_mod.solver = 'FAST'
-                
-                with bpy.context.temp_override(object=wall_obj):
-                    bpy.ops.object.modifier_apply(modifier=f'BoolWindow_{i}_{w_idx}')
-                
-                bpy.data.objects.remove(window_cutter, do_unlink=True)
-            
-            log(f"Added {2} window openings to {wall_obj.name}")
+                dims = (window_width/2 + 0.01, size.y/2 + 0.1, window_height/2)
+                openings.setdefault(i, []).append((window_center, dims))
+
+def _boxes_overlap(boxes):
+    """True if any two (center, dims) boxes intersect"""
+    for a in range(len(boxes)):
+        ca, da = boxes[a]
+        for b in range(a + 1, len(boxes)):
+            cb, db = boxes[b]
+            if all(abs(ca[k] - cb[k]) * 2 < da[k] + db[k] for k in range(3)):
+                return True
+    return False
+
+def _box_hits_bounds(center, dims, bmin, bmax):
+    """Six-comparison AABB test of a (center, dims) box against wall bounds"""
+    for k in range(3):
+        half = dims[k] / 2
+        if center[k] + half < bmin[k] or center[k] - half > bmax[k]:
+            return False
+    return True
+
+def build_cutter_mesh(name, boxes):
+    """Build one mesh holding a cuboid per (center, dims) box"""
+    centers = np.array([tuple(c) for c, _ in boxes])
+    dims = np.array([d for _, d in boxes])
+    verts = centers[:, None, :] + _CUBE_VERTS[None] * dims[:, None, :]
+    faces = _CUBE_FACES[None] + 8 * np.arange(len(boxes))[:, None, None]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(verts.reshape(-1, 3).tolist(), [], faces.reshape(-1, 4).tolist())
+    mesh.update()
+    return mesh
+
+def create_all_openings(walls_data, openings):
+    """Cut all planned openings with a single boolean per wall
+    
+    Every door and window cutter of a wall is concatenated into one mesh, so
+    the wall's BVH is built once instead of once per opening.
+    """
+    log(f"Cutting openings into {len(openings)} walls")
+    start = time.perf_counter()
+    
+    cut_walls = []
+    bool_mods = []
+    cutters = []
+    
+    # Broad phase: drop cutters that miss the wall's current (post-Solidify)
+    # bounds; bound_box still reports the pre-Solidify mesh at this point
+    for i in list(openings):
+        wall_obj = walls_data[i]['obj']
+        if not wall_obj.data.vertices:
+            del openings[i]
+            continue
+        mn, mx = mesh_world_bounds(wall_obj)
+        openings[i] = [(c, d) for c, d in openings[i] if _box_hits_bounds(c, d, mn, mx)]
+        if not openings[i]:
+            del openings[i]
+    
+    # Smallest walls first, so the cheap BVH builds are done up front
+    order = sorted(openings, key=lambda i: len(walls_data[i]['obj'].data.polygons))
+    
+    for i in order:
+        boxes = openings[i]
+        wall_obj = walls_data[i]['obj']
+        
+        cutter = bpy.data.objects.new(f"OpeningCutter_{i}", build_cutter_mesh(f"OpeningCutter_{i}", boxes))
+        bpy.context.collection.objects.link(cutter)
+        
+        bool_mod = wall_obj.modifiers.new(name=f'BoolOpenings_{i}', type='BOOLEAN')
+        bool_mod.operation = 'DIFFERENCE'
+        bool_mod.object = cutter
+        if _boxes_overlap(boxes):
+            # Overlapping cuboids make a self-intersecting cutter; FAST can't resolve that
+            bool_mod.solver = 'EXACT'
+            bool_mod.use_self = True
+        else:
+            bool_mod.solver = 'FAST'
+        
+        cut_walls.append(wall_obj)
+        bool_mods.append(bool_mod)
+        cutters.append(cutter)
+    
+    # Apply every wall's boolean in one evaluation. FAST results that come
+    # out non-manifold are discarded and re-solved with EXACT in a second batch
+    if cut_walls:
+        depsgraph = bpy.context.evaluated_depsgraph_get()
+        retry = []
+        for wall_obj, bool_mod in zip(cut_walls, bool_mods):
+            new_mesh = bpy.data.meshes.new_from_object(wall_obj.evaluated_get(depsgraph))
+            if bool_mod.solver == 'FAST' and not _is_manifold(new_mesh):
+                bpy.data.meshes.remove(new_mesh)
+                bool_mod.solver = 'EXACT'
+                retry.append(wall_obj)
+            else:
+                _swap_mesh(wall_obj, new_mesh)
+        if retry:
+            log(f"Re-cutting {len(retry)} walls with the EXACT solver")
+            apply_modifiers_batched(retry)
+        
+        cutter_meshes = [c.data for c in cutters]
+        bpy.data.batch_remove(cutters + cutter_meshes)
+    
+    for i, boxes in openings.items():
+        log(f"Added {len(boxes)} openings to {walls_data[i]['obj'].name}", verbose=True)
+    total = sum(len(boxes) for boxes in openings.values())
+    log(f"Added {total} openings to {len(openings)} walls in {time.perf_counter() - start:.2f}s")
+
+def cut_openings(walls_data):
+    """Plan doors and windows for the given walls and cut them"""
+    openings = {}
+    create_door_openings(walls_data, openings, door_width=0.9, door_height=2.1)
+    create_window_openings(walls_data, openings, window_width=1.2, window_height=1.2, sill_height=0.9)
+    create_all_openings(walls_data, openings)
+
+def start_wall_workers(input_glb, wall_count, workers):
+    """Launch background Blender processes for thickness + openings
+    
+    Worker k re-imports the input, processes walls[k::workers] and writes the
+    finished meshes to a .blend library (lossless, unlike a GLB round trip).
+    Returns (tmp_dir, [(k, dst, process), ...]); release them with
+    stop_wall_workers once collected.
+    """
+    tmp_dir = tempfile.mkdtemp(prefix="type2_")
+    # Workers each get one core; keep NumPy from spawning a thread pool per process
+    env = dict(os.environ, OPENBLAS_NUM_THREADS='1', OMP_NUM_THREADS='1')
+    jobs = []
+    try:
+        for k in range(min(workers, wall_count)):
+            dst = os.path.join(tmp_dir, f"chunk_{k}.blend")
+            cmd = [bpy.app.binary_path, '--background', '--factory-startup', '--python-exit-code', '1',
+                   '--python', os.path.abspath(__file__), '--',
+                   input_glb, dst, '--chunk', f"{k}/{workers}"]
+            jobs.append((k, dst, subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL,
+                                                  stderr=subprocess.DEVNULL)))
+    except Exception:
+        stop_wall_workers(tmp_dir, jobs)
+        raise
+    log(f"Started {len(jobs)} wall worker processes")
+    return tmp_dir, jobs
+
+def stop_wall_workers(tmp_dir, jobs):
+    """Kill any worker still running and remove the temp directory"""
+    for _, _, proc in jobs:
+        if proc.poll() is None:
+            proc.kill()
+        proc.wait()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def collect_wall_workers(walls_data, tmp_dir, jobs, workers):
+    """Wait for the workers and swap their meshes into the walls
+    
+    A chunk whose worker failed is processed in this process instead.
+    """
+    for k, dst, proc in jobs:
+        chunk = walls_data[k::workers]
+        if proc.wait() != 0 or not os.path.exists(dst):
+            log(f"WARNING: worker {k} failed (exit {proc.returncode}), processing its {len(chunk)} walls locally")
+            apply_wall_thickness(chunk, wall_thickness=0.23)
+            cut_openings(chunk)
+            continue
+        with bpy.data.libraries.load(dst) as (data_from, data_to):
+            data_to.meshes = [f"chunk_{n}" for n in range(len(chunk))]
+        for wall_info, new_mesh in zip(chunk, data_to.meshes):
+            new_mesh.use_fake_user = False
+            _swap_mesh(wall_info['obj'], new_mesh)
+        log(f"Merged {len(chunk)} walls from worker {k}")
+
+def run_chunk_worker(input_glb, dst, index, count):
+    """--chunk entry point: thicken and cut walls[index::count] of the input"""
+    clear_scene()
+    walls_data, _ = get_walls_from_objects(import_glb(input_glb))
+    chunk = walls_data[index::count]
+    apply_wall_thickness(chunk, wall_thickness=0.23)
+    cut_openings(chunk)
+    
+    # Fixed names so the parent can load them back in order
+    for n, wall_info in enumerate(chunk):
+        wall_info['obj'].data.name = f"chunk_{n}"
+    bpy.data.libraries.write(dst, {w['obj'].data for w in chunk}, fake_user=True)
 
 def assign_materials(walls, floor, ceiling):
     """Assign architectural materials to objects"""
@@ -315,15 +544,14 @@ def assign_materials(walls, floor, ceiling):
     
     log("Materials assigned")
 
-def add_lighting_and_camera(walls_data, wall_height=3.0):
+def add_lighting_and_camera(walls_data, scene_bounds, wall_height=3.0):
     """Add sun light and isometric camera for architectural visualization"""
     log("Adding lighting and camera")
     
-    # Calculate scene bounds
-    if walls_data:
-        center_x = sum(w['center'].x for w in walls_data) / len(walls_data)
-        center_y = sum(w['center'].y for w in walls_data) / len(walls_data)
-        max_size = max(w['size'].x for w in walls_data)
+    # Scene framing from the bounds computed at wall extraction
+    if walls_data and scene_bounds:
+        center_x, center_y = scene_bounds['mean_center'].x, scene_bounds['mean_center'].y
+        max_size = scene_bounds['max_wall_size']
     else:
         center_x, center_y, max_size = 0, 0, 10
     
@@ -361,10 +589,13 @@ def add_lighting_and_camera(walls_data, wall_height=3.0):
 def apply_transforms(objects):
     """Apply all transforms to ensure clean geometry"""
     log("Applying transforms")
-    for obj in objects:
-        if obj.type == 'MESH':
-            bpy.context.view_layer.objects.active = obj
-            bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    if not meshes:
+        return
+    # One operator call over all meshes instead of re-activating each one
+    with bpy.context.temp_override(active_object=meshes[0], object=meshes[0],
+                                   selected_objects=meshes, selected_editable_objects=meshes):
+        bpy.ops.object.transform_apply(location=False, rotation=True, scale=True)
 
 def set_scene_properties():
     """Configure scene for architectural rendering"""
@@ -389,32 +620,26 @@ def set_scene_properties():
     scene.cycles.samples = 256
     scene.cycles.use_adaptive_sampling = True
 
+# glTF exporter options, picked once from the Blender version instead of
+# retrying on TypeError. Draco and the enum-valued export_materials are
+# available from 3.0; older exporters get the plain GLB options
+_EXPORT_KWARGS = {'export_format': 'GLB'}
+if bpy.app.version >= (3, 0, 0):
+    _EXPORT_KWARGS.update(
+        export_draco_mesh_compression_enable=True,
+        export_draco_mesh_compression_level=7,
+        export_image_format='AUTO',
+        export_materials='EXPORT',
+        export_lights=True,
+        export_cameras=True
+    )
+
 def export_glb(filepath):
     """Export scene as GLB with Draco compression"""
     log(f"Exporting to: {filepath}")
     
-    # Select all objects
-    bpy.ops.object.select_all(action='SELECT')
-    
-    # Export with correct parameters for Blender 5.0
-    try:
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            use_draco_mesh_compression=True,
-            draco_mesh_compression_level=7,
-            export_format='GLB',
-            export_image_format='AUTO',
-            export_materials=True,
-            export_lights=True,
-            export_cameras=True
-        )
-    except TypeError:
-        # Fallback with simpler parameters
-        log("Using simplified export parameters")
-        bpy.ops.export_scene.gltf(
-            filepath=filepath,
-            export_format='GLB'
-        )
+    # Whole scene; no select_all pass needed
+    bpy.ops.export_scene.gltf(filepath=filepath, use_selection=False, **_EXPORT_KWARGS)
     
     log(f"Export complete: {filepath}")
 
@@ -424,8 +649,19 @@ def main():
     if '--' in argv:
         argv = argv[argv.index('--') + 1:]
     
+    workers = 1
+    if '--workers' in argv:
+        idx = argv.index('--workers')
+        workers = max(1, int(argv[idx + 1]))
+        argv = argv[:idx] + argv[idx + 2:]
+    
+    if '--chunk' in argv and len(argv) >= 2:
+        index, count = map(int, argv[argv.index('--chunk') + 1].split('/'))
+        run_chunk_worker(argv[0], argv[1], index, count)
+        return
+    
     if len(argv) < 2:
-        log("Usage: blender --background --python convert_to_type2.py -- input.glb output.glb [--walls-file walls.json]")
+        log("Usage: blender --background --python convert_to_type2.py -- input.glb output.glb [--walls-file walls.json] [--workers N]")
         return
     
     input_glb = argv[0]
@@ -449,26 +685,37 @@ def main():
             return
         
         # Extract walls
-        walls_data = get_walls_from_objects(imported_objs)
+        walls_data, scene_bounds = get_walls_from_objects(imported_objs)
         if not walls_data:
             log("ERROR: No walls found")
             return
         
-        # Apply wall thickness
-        apply_wall_thickness(walls_data, wall_thickness=0.23)
-        
-        # Create floor and ceiling
-        floor_obj, ceiling_obj = create_floor_and_ceiling(walls_data, wall_height=3.0)
+        # Apply wall thickness (in worker processes when parallel)
+        tmp_dir = None
+        if workers > 1:
+            tmp_dir, jobs = start_wall_workers(input_glb, len(walls_data), workers)
+        else:
+            apply_wall_thickness(walls_data, wall_thickness=0.23)
         
-        # Create openings
-        create_door_openings(walls_data, door_width=0.9, door_height=2.1)
-        create_window_openings(walls_data, window_width=1.2, window_height=1.2, sill_height=0.9)
+        # Workers and their temp files must not outlive a failure in between
+        try:
+            # Create floor and ceiling
+            floor_obj, ceiling_obj = create_floor_and_ceiling(walls_data, scene_bounds, wall_height=3.0)
+            
+            # Create openings
+            if workers > 1:
+                collect_wall_workers(walls_data, tmp_dir, jobs, workers)
+            else:
+                cut_openings(walls_data)
+        finally:
+            if tmp_dir is not None:
+                stop_wall_workers(tmp_dir, jobs)
         
         # Apply materials
         assign_materials(walls_data, floor_obj, ceiling_obj)
         
         # Add lighting and camera
-        add_lighting_and_camera(walls_data, wall_height=3.0)
+        add_lighting_and_camera(walls_data, scene_bounds, wall_height=3.0)
         
         # Apply transforms
         all_objs = [w['obj'] for w in walls_data]
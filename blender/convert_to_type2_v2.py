@@ -19,11 +19,15 @@ blender --background --python convert_to_type2_v2.py -- input.glb output.glb
 """
 
 import bpy
+import bmesh
 import json
 import sys
 import os
+import time
+from collections import namedtuple
 from mathutils import Vector, Matrix
 import math
+import numpy as np
 
 # ============================================================================
 # CONFIGURATION
@@ -43,13 +47,19 @@ WINDOW_HEIGHT_M = 1.2
 # LOGGING
 # ============================================================================
 
+# DEBUG lines (per-wall progress) are dropped unless TYPE2_VERBOSE is set
+_VERBOSE = bool(os.environ.get("TYPE2_VERBOSE"))
+
 def log(msg, level="INFO"):
     """Structured logging"""
+    if level == "DEBUG" and not _VERBOSE:
+        return
     prefix = {
         "INFO": "[Type2:INFO]",
         "STEP": "[Type2:STEP]",
         "WARN": "[Type2:WARN]",
-        "ERR": "[Type2:ERROR]"
+        "ERR": "[Type2:ERROR]",
+        "DEBUG": "[Type2:DEBUG]"
     }.get(level, "[Type2]")
     print(f"{prefix} {msg}")
 
@@ -61,15 +71,9 @@ def clear_scene():
     """Remove all default objects and data"""
     log("Clearing scene", "STEP")
     
-    bpy.ops.object.select_all(action='SELECT')
-    bpy.ops.object.delete(use_global=False)
-    
-    for mesh in bpy.data.meshes:
-        bpy.data.meshes.remove(mesh)
-    for material in bpy.data.materials:
-        bpy.data.materials.remove(material)
-    for obj in bpy.data.objects:
-        bpy.data.objects.remove(obj)
+    # Single pass over objects, meshes and materials instead of an operator
+    # delete followed by three per-ID removal loops
+    bpy.data.batch_remove(ids=tuple(bpy.data.objects) + tuple(bpy.data.meshes) + tuple(bpy.data.materials))
 
 def configure_scene_units():
     """Set up Blender for metric, meter-based modeling"""
@@ -101,6 +105,73 @@ def import_glb(filepath):
     log(f"  Imported {len(imported)} objects", "INFO")
     return imported
 
+# Corners of the unit cube, stretched onto each object's local bound box
+_UNIT_CORNERS = np.array([(x, y, z) for x in (0, 1) for y in (0, 1) for z in (0, 1)], np.float32)
+
+def world_bounds(objects):
+    """World-space axis-aligned bounds of each object's bound_box
+    
+    Only the two extreme bound_box corners are read per object; all 8N
+    corners are rebuilt from _UNIT_CORNERS and transformed in one NumPy pass.
+    Returns: (mins, maxs) float32 arrays of shape (N, 3)
+    """
+    n = len(objects)
+    M = np.empty((n, 4, 4), np.float32)
+    lo = np.empty((n, 3), np.float32)
+    hi = np.empty((n, 3), np.float32)
+    for i, obj in enumerate(objects):
+        bbox = obj.bound_box
+        M[i] = obj.matrix_world
+        lo[i] = bbox[0]
+        hi[i] = bbox[6]
+    local = lo[:, None, :] + _UNIT_CORNERS * (hi - lo)[:, None, :]
+    world = np.einsum('nij,nkj->nki', M[:, :3, :3], local) + M[:, None, :3, 3]
+    return world.min(axis=1), world.max(axis=1)
+
+def mesh_world_bounds(obj):
+    """Exact world-space (min, max) of a mesh object from its vertex buffer
+    
+    Unlike bound_box, this is current right after the mesh data is replaced.
+    """
+    co = np.empty(len(obj.data.vertices) * 3, np.float32)
+    obj.data.vertices.foreach_get('co', co)
+    M = np.array(obj.matrix_world, np.float32)
+    world = co.reshape(-1, 3) @ M[:3, :3].T + M[:3, 3]
+    return world.min(axis=0), world.max(axis=0)
+
+# World-space bounds per object name ({'min','max','size','center'}), shared by
+# every pipeline pass; entries are updated or dropped when a transform changes
+_BBOX_CACHE = {}
+
+def _set_bounds(name, min_pt, max_pt):
+    _BBOX_CACHE[name] = {
+        'min': min_pt,
+        'max': max_pt,
+        'size': max_pt - min_pt,
+        'center': (min_pt + max_pt) / 2
+    }
+
+def _compute_bounds(objects):
+    """Return cached bounds for each object, transforming only uncached ones"""
+    missing = [obj for obj in objects if obj.name not in _BBOX_CACHE]
+    others = []
+    for obj in missing:
+        if obj.type == 'MESH' and obj.data.vertices:
+            mn, mx = mesh_world_bounds(obj)
+            _set_bounds(obj.name, Vector(mn.tolist()), Vector(mx.tolist()))
+        else:
+            others.append(obj)
+    if others:
+        mins, maxs = world_bounds(others)
+        for obj, mn, mx in zip(others, mins.tolist(), maxs.tolist()):
+            _set_bounds(obj.name, Vector(mn), Vector(mx))
+    return [_BBOX_CACHE[obj.name] for obj in objects]
+
+def invalidate_bounds(objects):
+    """Drop cached bounds of objects whose transform or mesh changed"""
+    for obj in objects:
+        _BBOX_CACHE.pop(obj.name, None)
+
 def analyze_geometry_bounds(objects):
     """Analyze bounding box of all geometry
     
@@ -113,26 +184,14 @@ def analyze_geometry_bounds(objects):
         return None
     
     # Calculate world-space bounding box
-    all_corners = []
-    for obj in objects:
-        if hasattr(obj, 'bound_box'):
-            corners = [obj.matrix_world @ Vector(corner) for corner in obj.bound_box]
-            all_corners.extend(corners)
-    
-    if not all_corners:
+    boxed = [obj for obj in objects if hasattr(obj, 'bound_box')]
+    if not boxed:
         log("Could not extract bounding box", "WARN")
         return None
     
-    min_pt = Vector((
-        min(p.x for p in all_corners),
-        min(p.y for p in all_corners),
-        min(p.z for p in all_corners)
-    ))
-    max_pt = Vector((
-        max(p.x for p in all_corners),
-        max(p.y for p in all_corners),
-        max(p.z for p in all_corners)
-    ))
+    cached = _compute_bounds(boxed)
+    min_pt = Vector(np.array([b['min'] for b in cached]).min(axis=0).tolist())
+    max_pt = Vector(np.array([b['max'] for b in cached]).max(axis=0).tolist())
     
     size = max_pt - min_pt
     center = (min_pt + max_pt) / 2
@@ -175,6 +234,59 @@ def compute_metric_scale(bounds):
     
     return scale
 
+def _scale_and_ground(objects, scale):
+    """Scale geometry about the origin and lift its lowest point to Z=0
+    
+    A uniform scale of every mesh and every location scales each world
+    transform (hierarchies included). One foreach_get per mesh feeds both the
+    world-space bounds and the scaled coordinates written back, so the Z
+    offset needs no second bounds pass. Returns the applied Z offset.
+    """
+    n = len(objects)
+    mins = np.empty((n, 3), np.float32)
+    maxs = np.empty((n, 3), np.float32)
+    buffers = {}  # mesh name -> (mesh, flat coords); shared meshes read once
+    others = []
+    
+    for i, obj in enumerate(objects):
+        if obj.type != 'MESH' or not obj.data.vertices:
+            others.append(i)
+            continue
+        mesh = obj.data
+        if mesh.name not in buffers:
+            co = np.empty(len(mesh.vertices) * 3, np.float32)
+            mesh.vertices.foreach_get('co', co)
+            buffers[mesh.name] = (mesh, co)
+        co = buffers[mesh.name][1].reshape(-1, 3)
+        M = np.array(obj.matrix_world, np.float32)
+        world = co @ M[:3, :3].T + M[:3, 3]
+        mins[i] = world.min(axis=0)
+        maxs[i] = world.max(axis=0)
+    if others:
+        mins[others], maxs[others] = world_bounds([objects[i] for i in others])
+    
+    mins *= scale
+    maxs *= scale
+    z_offset = -float(mins[:, 2].min())
+    mins[:, 2] += z_offset
+    maxs[:, 2] += z_offset
+    
+    for mesh, co in buffers.values():
+        co *= scale
+        mesh.vertices.foreach_set('co', co)
+        mesh.update()
+    
+    names = {obj.name for obj in objects}
+    for obj in objects:
+        obj.location *= scale
+        # Children follow their parent's shift
+        if obj.parent is None or obj.parent.name not in names:
+            obj.location.z += z_offset
+    
+    for obj, mn, mx in zip(objects, mins.tolist(), maxs.tolist()):
+        _set_bounds(obj.name, Vector(mn), Vector(mx))
+    return z_offset
+
 def apply_metric_normalization(objects, bounds, scale):
     """Apply global scale and center geometry
     
@@ -191,39 +303,9 @@ def apply_metric_normalization(objects, bounds, scale):
     
     log(f"  Scaling all geometry by {scale:.6f}x", "INFO")
     
-    # Create a parent object to scale everything uniformly
-    bpy.ops.object.empty_add(type='PLAIN_AXES', location=(0, 0, 0))
-    scale_parent = bpy.context.active_object
-    scale_parent.name = "MetricScaler"
-    
-    # Parent all objects to the scaler
-    for obj in objects:
-        obj.parent = scale_parent
-    
-    # Apply scale
-    scale_parent.scale = (scale, scale, scale)
-    
-    # Apply the scale transformation
-    bpy.context.view_layer.objects.active = scale_parent
-    bpy.ops.object.transform_apply(scale=True)
-    
-    # Unparent and delete the scaler
-    bpy.ops.object.select_all(action='DESELECT')
-    for obj in objects:
-        obj.select_set(True)
-        obj.parent = None
-    
-    bpy.data.objects.remove(scale_parent, do_unlink=True)
-    
-    # Now shift everything so that Z=0 is at the ground
-    # (Lowest point should be at Z = 0)
-    new_bounds = analyze_geometry_bounds(objects)
-    if new_bounds:
-        z_offset = -new_bounds['min'].z
-        log(f"  Shifting geometry up by {z_offset:.3f}m to place floor at Z=0", "INFO")
-        
-        for obj in objects:
-            obj.location.z += z_offset
+    z_offset = _scale_and_ground(objects, scale)
+    bpy.context.view_layer.update()
+    log(f"  Shifted geometry up by {z_offset:.3f}m to place floor at Z=0", "INFO")
     
     log(f"  Normalization complete: 1 unit = 1 meter", "INFO")
 
@@ -234,58 +316,119 @@ def apply_metric_normalization(objects, bounds, scale):
 def extract_walls(objects):
     """Extract wall meshes and their properties
     
-    Returns: list of dicts with 'obj', 'center', 'bounds'
+    Returns: (walls, footprint) where walls is a list of dicts with 'obj',
+    'center', 'bounds' and footprint is an (N, 2, 2) array of each wall's
+    XY [min, max] corners
     """
     log("Extracting wall geometry", "STEP")
     
     walls = []
-    for obj in objects:
-        if obj.type == 'MESH':
-            bbox_corners = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            min_pt = Vector((min(p.x for p in bbox_corners),
-                           min(p.y for p in bbox_corners),
-                           min(p.z for p in bbox_corners)))
-            max_pt = Vector((max(p.x for p in bbox_corners),
-                           max(p.y for p in bbox_corners),
-                           max(p.z for p in bbox_corners)))
-            
-            size = max_pt - min_pt
-            center = (min_pt + max_pt) / 2
-            
-            walls.append({
-                'obj': obj,
-                'center': center,
-                'bounds': {'min': min_pt, 'max': max_pt},
-                'size': size
-            })
+    meshes = [obj for obj in objects if obj.type == 'MESH']
+    for obj, b in zip(meshes, _compute_bounds(meshes)):
+        walls.append({
+            'obj': obj,
+            'center': b['center'].copy(),
+            'bounds': {'min': b['min'].copy(), 'max': b['max'].copy()},
+            'size': b['size'].copy()
+        })
+    
+    footprint = np.array([[w['bounds']['min'].xy, w['bounds']['max'].xy] for w in walls],
+                         dtype=np.float64).reshape(-1, 2, 2)
     
     log(f"  Found {len(walls)} wall objects", "INFO")
-    return walls
+    return walls, footprint
+
+# Footprint aggregates shared by the slab and camera steps
+WallStats = namedtuple('WallStats', 'center_x center_y max_size min_x max_x min_y max_y')
+
+def summarize_walls(footprint):
+    """Reduce the (N, 2, 2) wall footprint array to WallStats, or None if empty"""
+    if not len(footprint):
+        return None
+    min_x, min_y = footprint.min(axis=(0, 1)).tolist()
+    max_x, max_y = footprint.max(axis=(0, 1)).tolist()
+    # Mean wall center and widest wall along X
+    center_x, center_y = footprint.mean(axis=(0, 1)).tolist()
+    max_size = float((footprint[:, 1, 0] - footprint[:, 0, 0]).max())
+    return WallStats(center_x, center_y, max_size, min_x, max_x, min_y, max_y)
+
+def apply_modifiers_batched(objects):
+    """Bake the modifier stacks of all objects with one depsgraph evaluation
+    
+    Replaces per-object modifier_apply calls, each of which re-evaluates
+    the whole scene.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    for obj in objects:
+        _swap_mesh(obj, bpy.data.meshes.new_from_object(obj.evaluated_get(depsgraph)))
+
+def _swap_mesh(obj, new_mesh):
+    """Give obj its baked mesh, drop its modifiers and free the old mesh"""
+    old_mesh = obj.data
+    obj.data = new_mesh
+    obj.modifiers.clear()
+    if old_mesh.users == 0:
+        name = old_mesh.name
+        bpy.data.meshes.remove(old_mesh)
+        new_mesh.name = name
+
+def _is_manifold(mesh):
+    """True if every edge of the mesh is shared by exactly two faces"""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    manifold = all(e.is_manifold for e in bm.edges)
+    bm.free()
+    return manifold
+
+def delete_loose(mesh, fix_normals=False):
+    """bmesh equivalent of edit-mode mesh.delete_loose (loose edges and verts)
+    
+    With fix_normals, the same pass also does what fix_normals_and_shading
+    would: consistent outward normals and smooth shading. Otherwise the mesh
+    is only written back when something was actually removed.
+    """
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    loose_edges = [e for e in bm.edges if not e.link_faces]
+    if loose_edges:
+        bmesh.ops.delete(bm, geom=loose_edges, context='EDGES')
+    loose_verts = [v for v in bm.verts if not v.link_edges]
+    if loose_verts:
+        bmesh.ops.delete(bm, geom=loose_verts, context='VERTS')
+    if fix_normals:
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        for f in bm.faces:
+            f.smooth = True
+    if loose_edges or loose_verts or fix_normals:
+        bm.to_mesh(mesh)
+    bm.free()
 
 def add_wall_thickness(walls):
     """Apply wall thickness using Solidify modifier (then apply)"""
     log("Adding wall thickness (0.23m)", "STEP")
+    start = time.perf_counter()
     
     for i, wall_info in enumerate(walls):
         obj = wall_info['obj']
         
-        # Ensure manifold by running a simple cleanup
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.delete_loose()
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Ensure manifold by running a simple cleanup; normals are fixed here
+        # too, Solidify and the opening booleans keep them consistent
+        delete_loose(obj.data, fix_normals=True)
+        obj['normals_ready'] = True
         
         # Add Solidify
         solidify = obj.modifiers.new(name='Solidify', type='SOLIDIFY')
         solidify.thickness = WALL_THICKNESS_M
         solidify.offset = 0.0  # Center thickness on original surface
-        
-        # Apply modifier
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.modifier_apply(modifier='Solidify')
-        
-        log(f"  Wall {i}: thickness applied", "INFO")
+    
+    # Apply all Solidify modifiers in a single depsgraph evaluation
+    apply_modifiers_batched([w['obj'] for w in walls])
+    
+    for i in range(len(walls)):
+        log(f"  Wall {i}: thickness applied", "DEBUG")
+    log(f"  Thickness applied to {len(walls)} walls in {time.perf_counter() - start:.2f}s", "INFO")
+    
+    invalidate_bounds([w['obj'] for w in walls])
 
 def extrude_walls_vertically(walls):
     """Extrude walls to standard height using scale transformation
@@ -293,6 +436,7 @@ def extrude_walls_vertically(walls):
     Strategy: Scale each wall in Z to achieve WALL_HEIGHT_M
     """
     log(f"Extruding walls to height {WALL_HEIGHT_M}m", "STEP")
+    start = time.perf_counter()
     
     for i, wall_info in enumerate(walls):
         obj = wall_info['obj']
@@ -312,34 +456,60 @@ def extrude_walls_vertically(walls):
         obj.scale.z = z_scale
         obj.location.z = target_z
         
-        # Apply transforms
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
+        # Bake the transform into the vertices (what transform_apply does)
+        M = np.array(obj.matrix_basis, np.float32)
+        co = np.empty(len(obj.data.vertices) * 3, np.float32)
+        obj.data.vertices.foreach_get('co', co)
+        co = co.reshape(-1, 3) @ M[:3, :3].T + M[:3, 3]
+        obj.data.vertices.foreach_set('co', co.ravel())
+        obj.data.update()
+        obj.matrix_basis = Matrix.Identity(4)
         
-        log(f"  Wall {i}: extruded to {WALL_HEIGHT_M}m height", "INFO")
+        log(f"  Wall {i}: extruded to {WALL_HEIGHT_M}m height", "DEBUG")
+    
+    log(f"  Extruded {len(walls)} walls in {time.perf_counter() - start:.2f}s", "INFO")
+    
+    invalidate_bounds([w['obj'] for w in walls])
 
 # ============================================================================
 # STEP 3: FLOOR & CEILING GENERATION
 # ============================================================================
 
-def create_floor_and_ceiling(walls):
-    """Create floor slab and ceiling slab"""
+def build_boxes(name, boxes):
+    """One mesh object holding a size=1 cube per (location, scale) box
+    
+    Vertices are written already placed, so no operator or transform_apply
+    is involved. Overlapping boxes are not merged. Normals and smooth
+    shading are set here, so STEP 5 skips the object.
+    """
+    bm = bmesh.new()
+    for location, scale in boxes:
+        bmesh.ops.create_cube(bm, size=1.0, matrix=Matrix.LocRotScale(location, None, scale))
+    bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+    for f in bm.faces:
+        f.smooth = True
+    mesh = bpy.data.meshes.new(name)
+    bm.to_mesh(mesh)
+    bm.free()
+    obj = bpy.data.objects.new(name, mesh)
+    obj['normals_ready'] = True
+    bpy.context.collection.objects.link(obj)
+    return obj
+
+def make_box(name, center, scale):
+    """Size=1 cube scaled by scale and centered at center, as a new object"""
+    return build_boxes(name, [(center, scale)])
+
+def create_floor_and_ceiling(stats):
+    """Create floor slab and ceiling slab over the WallStats footprint"""
     log("Creating floor and ceiling slabs", "STEP")
     
-    if not walls:
+    if stats is None:
         log("No walls to generate floor/ceiling from", "WARN")
         return None, None
     
-    # Calculate building footprint bounds
-    all_x = []
-    all_y = []
-    for wall_info in walls:
-        bounds = wall_info['bounds']
-        all_x.extend([bounds['min'].x, bounds['max'].x])
-        all_y.extend([bounds['min'].y, bounds['max'].y])
-    
-    min_x, max_x = min(all_x), max(all_x)
-    min_y, max_y = min(all_y), max(all_y)
+    # Building footprint bounds
+    min_x, max_x, min_y, max_y = stats.min_x, stats.max_x, stats.min_y, stats.max_y
     
     floor_center_x = (min_x + max_x) / 2
     floor_center_y = (min_y + max_y) / 2
@@ -349,32 +519,22 @@ def create_floor_and_ceiling(walls):
     # Floor at Z = -floor_thickness/2 (so top surface is at Z=0)
     floor_z = -FLOOR_THICKNESS_M / 2
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(floor_center_x, floor_center_y, floor_z)
+    floor_obj = make_box(
+        "Floor",
+        (floor_center_x, floor_center_y, floor_z),
+        (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
     )
-    floor_obj = bpy.context.active_object
-    floor_obj.name = "Floor"
-    floor_obj.scale = (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
-    
-    bpy.context.view_layer.objects.active = floor_obj
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
     
     log(f"  Floor created: {floor_width:.2f}m x {floor_depth:.2f}m", "INFO")
     
     # Ceiling at Z = wall_height_m + ceiling_thickness/2
     ceiling_z = WALL_HEIGHT_M + FLOOR_THICKNESS_M / 2
     
-    bpy.ops.mesh.primitive_cube_add(
-        size=1,
-        location=(floor_center_x, floor_center_y, ceiling_z)
+    ceiling_obj = make_box(
+        "Ceiling",
+        (floor_center_x, floor_center_y, ceiling_z),
+        (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
     )
-    ceiling_obj = bpy.context.active_object
-    ceiling_obj.name = "Ceiling"
-    ceiling_obj.scale = (floor_width/2, floor_depth/2, FLOOR_THICKNESS_M/2)
-    
-    bpy.context.view_layer.objects.active = ceiling_obj
-    bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
     
     log(f"  Ceiling created at height {WALL_HEIGHT_M:.2f}m", "INFO")
     
@@ -384,14 +544,27 @@ def create_floor_and_ceiling(walls):
 # STEP 4: OPENINGS (DOORS & WINDOWS)
 # ============================================================================
 
-def create_door_openings(walls):
-    """Add door openings to walls using boolean difference"""
+def _cutter_hits_bounds(location, scale, bounds):
+    """Six-comparison AABB test of a size=1 cube cutter against wall bounds"""
+    for k in range(3):
+        half = scale[k] / 2
+        if location[k] + half < bounds['min'][k] or location[k] - half > bounds['max'][k]:
+            return False
+    return True
+
+def create_door_openings(walls, openings):
+    """Plan door openings; cut by apply_all_openings
+    
+    Appends (location, scale) cutter boxes to openings[wall index].
+    """
     log(f"Creating door openings ({DOOR_WIDTH_M}m x {DOOR_HEIGHT_M}m)", "STEP")
     
     doors_created = 0
     
-    for i, wall_info in enumerate(walls):
-        wall_obj = wall_info['obj']
+    # Current (extruded) wall bounds for broad-phase rejection
+    live_bounds = _compute_bounds([w['obj'] for w in walls])
+    
+    for i, (wall_info, bounds) in enumerate(zip(walls, live_bounds)):
         center = wall_info['center']
         size = wall_info['size']
         
@@ -399,44 +572,29 @@ def create_door_openings(walls):
         if size.x > DOOR_WIDTH_M and size.y > DOOR_WIDTH_M:
             # Door positioned at center of wall, bottom edge at 0m height
             door_z = DOOR_HEIGHT_M / 2  # Center height of door
+            location = (center.x, center.y, door_z)
+            scale = (DOOR_WIDTH_M/2 + 0.02, size.y/2 + 0.1, DOOR_HEIGHT_M/2)
             
-            # Create door cutter
-            bpy.ops.mesh.primitive_cube_add(
-                size=1,
-                location=(center.x, center.y, door_z)
-            )
-            door_cutter = bpy.context.active_object
-            door_cutter.name = f"DoorCutter_{i}"
-            door_cutter.scale = (DOOR_WIDTH_M/2 + 0.02, size.y/2 + 0.1, DOOR_HEIGHT_M/2)
-            
-            bpy.context.view_layer.objects.active = door_cutter
-            bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-            
-            # Boolean difference
-            bool_mod = wall_obj.modifiers.new(name=f'DoorBool_{i}', type='BOOLEAN')
-            bool_mod.operation = 'DIFFERENCE'
-            bool_mod.object = door_cutter
-            bool_mod.solver = 'MANIFOLD'
+            # Skip the opening entirely if the cutter misses the wall
+            if not _cutter_hits_bounds(location, scale, bounds):
+                continue
             
-            bpy.context.view_layer.objects.active = wall_obj
-            bpy.ops.object.modifier_apply(modifier=f'DoorBool_{i}')
-            
-            # Clean up cutter
-            bpy.data.objects.remove(door_cutter, do_unlink=True)
+            openings.setdefault(i, []).append((location, scale))
             
             doors_created += 1
-            log(f"  Door added to wall {i}", "INFO")
+            log(f"  Door added to wall {i}", "DEBUG")
     
     log(f"  Total doors created: {doors_created}", "INFO")
 
-def create_window_openings(walls):
-    """Add window openings to walls"""
+def create_window_openings(walls, openings):
+    """Plan window openings; cut by apply_all_openings"""
     log(f"Creating window openings ({WINDOW_WIDTH_M}m x {WINDOW_HEIGHT_M}m @ {WINDOW_SILL_HEIGHT_M}m sill)", "STEP")
     
     windows_created = 0
     
-    for i, wall_info in enumerate(walls):
-        wall_obj = wall_info['obj']
+    live_bounds = _compute_bounds([w['obj'] for w in walls])
+    
+    for i, (wall_info, bounds) in enumerate(zip(walls, live_bounds)):
         center = wall_info['center']
         size = wall_info['size']
         
@@ -448,69 +606,109 @@ def create_window_openings(walls):
                 
                 # Center of window
                 window_z = WINDOW_SILL_HEIGHT_M + WINDOW_HEIGHT_M / 2
+                location = (center.x + x_offset, center.y, window_z)
+                scale = (WINDOW_WIDTH_M/2 + 0.02, size.y/2 + 0.1, WINDOW_HEIGHT_M/2)
                 
-                # Create cutter
-                bpy.ops.mesh.primitive_cube_add(
-                    size=1,
-                    location=(center.x + x_offset, center.y, window_z)
-                )
-                window_cutter = bpy.context.active_object
-                window_cutter.name = f"WindowCutter_{i}_{w_idx}"
-                window_cutter.scale = (WINDOW_WIDTH_M/2 + 0.02, size.y/2 + 0.1, WINDOW_HEIGHT_M/2)
-                
-                bpy.context.view_layer.objects.active = window_cutter
-                bpy.ops.object.transform_apply(location=True, rotation=True, scale=True)
-                
-                # Boolean
-                bool_mod = wall_obj.modifiers.new(name=f'WindowBool_{i}_{w_idx}', type='BOOLEAN')
-                bool_mod.operation = 'DIFFERENCE'
-                bool_mod.object = window_cutter
-                bool_mod.solver = 'MANIFOLD'
+                if not _cutter_hits_bounds(location, scale, bounds):
+                    continue
                 
-                bpy.context.view_layer.objects.active = wall_obj
-                bpy.ops.object.modifier_apply(modifier=f'WindowBool_{i}_{w_idx}')
-                
-                bpy.data.objects.remove(window_cutter, do_unlink=True)
+                openings.setdefault(i, []).append((location, scale))
                 
                 windows_created += 1
     
     log(f"  Total windows created: {windows_created}", "INFO")
 
+def apply_all_openings(walls, openings):
+    """Cut every planned door and window with one boolean per wall
+    
+    A wall with a door and two windows pays for one solve instead of three.
+    The cutters are padded axis-aligned boxes spanning the wall thickness,
+    so the float FAST solver handles them; MANIFOLD is only the fallback.
+    All walls are baked from a single depsgraph evaluation rather than one
+    modifier_apply (and scene re-evaluation) per wall.
+    """
+    log(f"Cutting openings into {len(openings)} walls", "STEP")
+    
+    cut_walls = []
+    cutters = []
+    for i, boxes in openings.items():
+        wall_obj = walls[i]['obj']
+        # A wall's boxes never overlap (windows only go on walls wider than
+        # two window widths), so the concatenated cubes are a valid union
+        cutter_union = build_boxes(f"Cutter_{i}", boxes)
+        
+        bool_mod = wall_obj.modifiers.new(name='Openings', type='BOOLEAN')
+        bool_mod.operation = 'DIFFERENCE'
+        bool_mod.object = cutter_union
+        bool_mod.solver = 'FAST'
+        
+        cut_walls.append(wall_obj)
+        cutters.append(cutter_union)
+    
+    if not cut_walls:
+        return
+    
+    # FAST results that break a manifold wall are discarded and re-solved
+    # with MANIFOLD in a second batch
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    retry = []
+    for wall_obj in cut_walls:
+        new_mesh = bpy.data.meshes.new_from_object(wall_obj.evaluated_get(depsgraph))
+        if not _is_manifold(new_mesh) and _is_manifold(wall_obj.data):
+            bpy.data.meshes.remove(new_mesh)
+            wall_obj.modifiers['Openings'].solver = 'MANIFOLD'
+            retry.append(wall_obj)
+        else:
+            _swap_mesh(wall_obj, new_mesh)
+    if retry:
+        log(f"  {len(retry)} walls needed the MANIFOLD fallback", "INFO")
+        apply_modifiers_batched(retry)
+    
+    # Clean up the union cutters and their meshes
+    bpy.data.batch_remove(cutters + [c.data for c in cutters])
+    
+    invalidate_bounds(cut_walls)
+
 # ============================================================================
 # STEP 5: SCENE VALIDATION & NORMALS
 # ============================================================================
 
 def fix_normals_and_shading(objects):
-    """Recalculate normals and apply auto-smooth"""
+    """Recalculate normals and apply auto-smooth
+    
+    Objects whose builder already did this (normals_ready) are skipped.
+    """
     log("Fixing normals and shading", "STEP")
     
+    fixed = 0
     for obj in objects:
-        if obj.type != 'MESH':
+        if obj.type != 'MESH' or obj.get('normals_ready'):
             continue
+        mesh = obj.data
         
-        bpy.context.view_layer.objects.active = obj
-        bpy.ops.object.shade_smooth()
+        # Recalculate normals (outward) without an edit-mode round trip
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+        bm.to_mesh(mesh)
+        bm.free()
         
-        # Recalculate normals
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.mesh.normals_make_consistent(inside=False)
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # shade_smooth without the operator
+        mesh.polygons.foreach_set('use_smooth', np.ones(len(mesh.polygons), dtype=bool))
+        mesh.update()
+        fixed += 1
     
-    log(f"  Normals recalculated for {len(objects)} objects", "INFO")
+    log(f"  Normals recalculated for {fixed} of {len(objects)} objects", "INFO")
 
 def validate_dimensions(walls, floor, ceiling):
     """Validate that dimensions are correct"""
     log("Validating model dimensions", "STEP")
     
     if walls:
-        for i, wall_info in enumerate(walls):
-            obj = wall_info['obj']
-            bbox = [obj.matrix_world @ Vector(c) for c in obj.bound_box]
-            
-            min_z = min(c.z for c in bbox)
-            max_z = max(c.z for c in bbox)
-            height = max_z - min_z
+        # Vertex-based bounds, transformed in NumPy; bound_box can lag behind
+        # the meshes swapped in by the opening bake
+        for i, b in enumerate(_compute_bounds([w['obj'] for w in walls])):
+            height = b['size'].z
             
             log(f"  Wall {i}: height {height:.3f}m (expected ~{WALL_HEIGHT_M}m)", "INFO")
 
@@ -518,10 +716,19 @@ def validate_dimensions(walls, floor, ceiling):
 # STEP 6: VISUALIZATION READINESS
 # ============================================================================
 
+# Node-tree material copied by create_material instead of building a fresh
+# default tree per material
+_MATERIAL_TEMPLATE = None
+
 def create_material(name, color_rgb, roughness=0.6):
-    """Create PBR material"""
-    mat = bpy.data.materials.new(name=name)
-    mat.use_nodes = True
+    """Create PBR material from the shared template"""
+    global _MATERIAL_TEMPLATE
+    if _MATERIAL_TEMPLATE is None:
+        _MATERIAL_TEMPLATE = bpy.data.materials.new(name="_type2_template")
+        _MATERIAL_TEMPLATE.use_nodes = True
+    
+    mat = _MATERIAL_TEMPLATE.copy()
+    mat.name = name
     bsdf = mat.node_tree.nodes.get("Principled BSDF")
     if bsdf:
         bsdf.inputs['Base Color'].default_value = (*color_rgb, 1.0)
@@ -559,15 +766,13 @@ def assign_materials(walls, floor, ceiling):
     
     log(f"  Materials assigned", "INFO")
 
-def add_lighting_and_camera(walls):
+def add_lighting_and_camera(stats):
     """Add sun light and architectural camera"""
     log("Adding lighting and camera", "STEP")
     
-    # Calculate scene center
-    if walls:
-        center_x = sum(w['center'].x for w in walls) / len(walls)
-        center_y = sum(w['center'].y for w in walls) / len(walls)
-        max_size = max(w['size'].x for w in walls)
+    # Scene center from WallStats
+    if stats is not None:
+        center_x, center_y, max_size = stats.center_x, stats.center_y, stats.max_size
     else:
         center_x, center_y, max_size = 0, 0, 10
     
@@ -613,12 +818,12 @@ def export_to_glb(filepath):
     """Export scene as GLB"""
     log(f"Exporting to {filepath}", "STEP")
     
-    bpy.ops.object.select_all(action='SELECT')
-    
+    # Whole scene; no select_all pass needed
     try:
         bpy.ops.export_scene.gltf(
             filepath=filepath,
-            export_format='GLB'
+            export_format='GLB',
+            use_selection=False
         )
         log(f"  Export successful", "INFO")
     except Exception as e:
@@ -658,16 +863,19 @@ def main():
         apply_metric_normalization(imported, bounds, scale)
         
         # STEP 2: Wall Volume
-        walls = extract_walls(imported)
+        walls, footprint = extract_walls(imported)
+        stats = summarize_walls(footprint)
         add_wall_thickness(walls)
         extrude_walls_vertically(walls)
         
         # STEP 3: Floor & Ceiling
-        floor, ceiling = create_floor_and_ceiling(walls)
+        floor, ceiling = create_floor_and_ceiling(stats)
         
         # STEP 4: Openings
-        create_door_openings(walls)
-        create_window_openings(walls)
+        openings = {}
+        create_door_openings(walls, openings)
+        create_window_openings(walls, openings)
+        apply_all_openings(walls, openings)
         
         # STEP 5: Validation
         all_objs = [w['obj'] for w in walls] + [floor, ceiling] if floor and ceiling else [w['obj'] for w in walls]
@@ -676,7 +884,7 @@ def main():
         
         # STEP 6: Visualization
         assign_materials(walls, floor, ceiling)
-        add_lighting_and_camera(walls)
+        add_lighting_and_camera(stats)
         
         # STEP 7: Export
         export_to_glb(output_glb)
@@ -5,6 +5,8 @@ Run inside Blender:
 
 blender --background --python blender/generate_3d.py -- input/walls.json output/model.glb
 
+Pass `-` as the JSON path to read the walls JSON from stdin instead.
+
 The script reads JSON with structure: {"image": "...", "walls": [{x,y,w,h}, ...]}
 and generates a box for each wall bounding box, scaling pixels -> meters via `SCALE`.
 """
@@ -14,79 +16,105 @@ import os
 
 def main(json_in, gltf_out, scale=0.01, wall_height=3.0):
     import bpy
+    import bmesh
+    from mathutils import Matrix
     # Clear existing
     bpy.ops.wm.read_factory_settings(use_empty=True)
 
-    with open(json_in, 'r') as f:
-        data = json.load(f)
+    if json_in == '-':
+        data = json.load(sys.stdin)
+    else:
+        with open(json_in, 'r') as f:
+            data = json.load(f)
 
     walls = data.get('walls', [])
 
     import math
+    import numpy as np
     def add_prism_from_poly(poly_px, name, scale, height):
         # poly_px: list of [x,y] in pixel coordinates. Create prism extruded along Z
-        verts = []
-        for x_px, y_px in poly_px:
-            # convert pixel -> meters
-            vx = x_px * scale
-            vy = y_px * scale
-            verts.append((vx, vy, 0.0))
-        # top verts
-        top_offset = len(verts)
-        for x_px, y_px in poly_px:
-            vx = x_px * scale
-            vy = y_px * scale
-            verts.append((vx, vy, height))
-
-        faces = []
         n = len(poly_px)
         if n < 3:
             return
-        # bottom face (reverse order so normal points down)
-        faces.append([i for i in range(n-1, -1, -1)])
-        # top face
-        faces.append([top_offset + i for i in range(0, n)])
-        # side faces
-        for i in range(n):
-            i2 = (i + 1) % n
-            faces.append([i, i2, top_offset + i2, top_offset + i])
+        # bottom ring then top ring, pixel -> meters
+        poly = np.asarray(poly_px, dtype=np.float32) * scale
+        verts = np.empty((2 * n, 3), dtype=np.float32)
+        verts[:n, :2] = poly
+        verts[n:, :2] = poly
+        verts[:n, 2] = 0.0
+        verts[n:, 2] = height
+
+        ring = np.arange(n, dtype=np.int32)
+        nxt = np.roll(ring, -1)
+        # bottom face (reverse order so normal points down), top face, then
+        # one quad per side
+        loops = np.concatenate([
+            ring[::-1],
+            n + ring,
+            np.stack([ring, nxt, n + nxt, n + ring], axis=1).ravel(),
+        ])
+        totals = np.array([n, n] + [4] * n, dtype=np.int32)
+        starts = np.concatenate([[0], np.cumsum(totals[:-1])]).astype(np.int32)
 
         mesh = bpy.data.meshes.new(name + '_mesh')
-        mesh.from_pydata(verts, [], faces)
-        mesh.update()
+        mesh.vertices.add(2 * n)
+        mesh.vertices.foreach_set('co', verts.ravel())
+        mesh.loops.add(len(loops))
+        mesh.loops.foreach_set('vertex_index', loops)
+        mesh.polygons.add(n + 2)
+        mesh.polygons.foreach_set('loop_start', starts)
+        if bpy.app.version < (4, 0, 0):
+            # derived from loop_start (read-only) since 4.0
+            mesh.polygons.foreach_set('loop_total', totals)
+        mesh.update(calc_edges=True)
         obj = bpy.data.objects.new(name, mesh)
         bpy.context.collection.objects.link(obj)
         return obj
 
+    def cut_doors(obj, doors, name):
+        # one cutter mesh holding a cube per door, subtracted with a single
+        # boolean instead of one modifier_apply per door
+        bm = None
+        for d in doors:
+            # door center and length in pixels
+            c = d.get('center_px')
+            length_px = d.get('length_px', 50)
+            if c is None:
+                continue
+            door_w = length_px * scale
+            door_h = 2.1  # meters
+            if bm is None:
+                bm = bmesh.new()
+            # cutter larger than wall thickness to ensure subtraction:
+            # X along image X, Y large to span wall, Z = door_h
+            bmesh.ops.create_cube(bm, size=1, matrix=Matrix.LocRotScale(
+                (c[0]*scale, c[1]*scale, door_h/2), None, (door_w/2.0, max(1.0, 5.0), door_h/2.0)))
+        if bm is None:
+            return
+        cutter_mesh = bpy.data.meshes.new(name)
+        bm.to_mesh(cutter_mesh)
+        bm.free()
+        cutter = bpy.data.objects.new(name, cutter_mesh)
+        bpy.context.collection.objects.link(cutter)
+        # boolean modifier
+        mod = obj.modifiers.new(name='bool_cut', type='BOOLEAN')
+        mod.object = cutter
+        mod.operation = 'DIFFERENCE'
+        # neighbouring doors' cubes may overlap inside the single cutter
+        mod.use_self = True
+        bpy.context.view_layer.objects.active = obj
+        bpy.ops.object.modifier_apply(modifier=mod.name)
+        # remove cutter
+        bpy.data.objects.remove(cutter, do_unlink=True)
+        bpy.data.meshes.remove(cutter_mesh)
+
     for i, w in enumerate(walls):
         # prefer polygon if available
         poly = w.get('poly')
         if poly and len(poly) >= 3:
             obj = add_prism_from_poly(poly, f'wall_{i}', scale, wall_height)
             # apply door boolean cuts if present
-            for d in w.get('doors', []):
-                # door center and length in pixels
-                c = d.get('center_px')
-                length_px = d.get('length_px', 50)
-                if c is None:
-                    continue
-                door_w = length_px * scale
-                door_h = 2.1  # meters
-                # create a cutter cube larger than wall thickness to ensure subtraction
-                cutter_name = f'cutter_{i}'
-                bpy.ops.mesh.primitive_cube_add(size=1, location=(c[0]*scale, c[1]*scale, door_h/2))
-                cutter = bpy.context.active_object
-                # set cutter dimensions: X along image X, Y large to span wall, Z = door_h
-                cutter.scale = (door_w/2.0, max(1.0, 5.0), door_h/2.0)
-                cutter.name = cutter_name
-                # boolean modifier
-                mod = obj.modifiers.new(name='bool_cut', type='BOOLEAN')
-                mod.object = cutter
-                mod.operation = 'DIFFERENCE'
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.modifier_apply(modifier=mod.name)
-                # remove cutter
-                bpy.data.objects.remove(cutter, do_unlink=True)
+            cut_doors(obj, w.get('doors', []), f'cutter_{i}')
         else:
             # fallback to bbox
             bbox = w.get('bbox') or w
@@ -104,22 +132,7 @@ def main(json_in, gltf_out, scale=0.01, wall_height=3.0):
             obj.scale = (sx / 2.0, sy / 2.0, sz / 2.0)
             obj.name = f'wall_{i}'
             # boolean cut doors for bbox-based walls
-            for d in w.get('doors', []):
-                c = d.get('center_px')
-                length_px = d.get('length_px', 50)
-                if c is None:
-                    continue
-                door_w = length_px * scale
-                door_h = 2.1
-                bpy.ops.mesh.primitive_cube_add(size=1, location=(c[0]*scale, c[1]*scale, door_h/2))
-                cutter = bpy.context.active_object
-                cutter.scale = (door_w/2.0, max(1.0, 5.0), door_h/2.0)
-                mod = obj.modifiers.new(name='bool_cut', type='BOOLEAN')
-                mod.object = cutter
-                mod.operation = 'DIFFERENCE'
-                bpy.context.view_layer.objects.active = obj
-                bpy.ops.object.modifier_apply(modifier=mod.name)
-                bpy.data.objects.remove(cutter, do_unlink=True)
+            cut_doors(obj, w.get('doors', []), f'cutter_{i}')
 
     # Export glTF
     os.makedirs(os.path.dirname(gltf_out), exist_ok=True)
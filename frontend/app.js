@@ -20,6 +20,21 @@ let calibratePts = [];
 // per-image extras
 let extras = { doors: [], windows: [], scale: null };
 
+// Blender runs in the background; poll /jobs/<id> until it finishes or
+// timeoutMs passes (the server gives each of its two Blender runs 5 minutes,
+// plus time queued behind other jobs)
+async function waitForJob(jobId, intervalMs = 2000, timeoutMs = 15 * 60 * 1000){
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    const res = await fetch(API_BASE + '/jobs/' + jobId);
+    if (!res.ok) return null;
+    const job = await res.json();
+    if (job.status === 'done' || job.status === 'failed') return job;
+    await new Promise(r => setTimeout(r, intervalMs));
+  }
+  return null;
+}
+
 function setCanvasSize() {
   overlay.width = previewImg.clientWidth;
   overlay.height = previewImg.clientHeight;
@@ -89,6 +104,10 @@ generate3d.addEventListener('click', async ()=>{
   const res = await fetch(API_BASE + '/upload', {method:'POST', body: new FormData(document.getElementById('uploadForm'))});
   if (!res.ok) { info.textContent='3D generation failed'; const t=await res.json().catch(()=>null); console.error(t); return; }
   const d = await res.json();
+  if (res.status === 202 && d.job_id) {
+    const job = await waitForJob(d.job_id);
+    d.gltf = job ? job.gltf : null;
+  }
   if (d.gltf) {
     info.textContent = '✓ 3D model generated! ';
     // Provide download link